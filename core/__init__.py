@@ -0,0 +1,10 @@
+"""Shared data, caching and computation helpers used by the tab modules."""
+import pandas as pd
+
+# Copy-on-Write makes frames derived from a shared dataset (column subsets,
+# filters, frames with added columns) reuse its buffers until written to,
+# so examples that add a column never copy the rest of the frame. It is
+# always on from pandas 3.0; enable it explicitly for pandas 2.x, here so
+# it holds for the app and the command line alike.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
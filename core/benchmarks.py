@@ -0,0 +1,315 @@
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import categorical, compare, dataset, dedup, loadgen, sections, topk, windows
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# benchmark name -> function(rows) returning [(label, seconds, Bytes or Failed), ...]
+BENCHMARKS = {}
+
+# Modules the app imports on startup, and heavy ones it must only load lazily
+APP_MODULES = (
+    'tabs.tab0_download', 'tabs.tab1_intro', 'tabs.tab2_aggregating',
+    'tabs.tab3_slicing', 'tabs.tab4_creating_viz', 'tabs.tab5_comparison',
+)
+LAZY_MODULES = ('matplotlib', 'seaborn')
+
+# Milliseconds a cold import of APP_MODULES may take
+IMPORT_BUDGET_MS = 1500
+
+
+def benchmark(name):
+    """Register a benchmark runnable with ``python main.py bench <name>``"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+class Bytes(int):
+    """A benchmark measurement in bytes rather than seconds"""
+
+
+class Failed(str):
+    """A measurement that could not be taken, holding the error"""
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def allocated(func, *args, **kwargs):
+    """Peak bytes allocated while func runs, as traced by tracemalloc
+
+    NumPy buffers are traced; Arrow-backed string columns are immutable and
+    never copied, so they would not add anything.
+    """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return Bytes(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+
+def synthetic_frame(rows, stores=50, seed=0):
+    """Sales-shaped frame of the given size: one row per store per day"""
+    rng = np.random.default_rng(seed)
+    days = max(-(-rows // stores), 1)
+    return pd.DataFrame({
+        'Date': np.tile(pd.date_range('2020-01-01', periods=days, freq='D').values, stores)[:rows],
+        'Store': np.repeat([f'Store_{i:04d}' for i in range(stores)], days)[:rows],
+        'Sales': rng.normal(3000, 500, rows).round(2),
+        'Customers': rng.integers(50, 200, rows),
+    })
+
+
+@benchmark("windows")
+def windows_benchmark(rows):
+    df = synthetic_frame(rows)
+    sizes = (7, 28, 91)
+    stats = ('sum', 'mean', 'count', 'min', 'max')
+
+    def chained():
+        ordered = df.sort_values(['Store', 'Date'])
+        grouped = ordered.groupby('Store')
+        for w in sizes:
+            rolling = grouped.rolling(f'{w}D', on='Date')['Sales']
+            for stat in stats:
+                rolling.agg(stat)
+
+    return [
+        ("groupby().rolling() chained", timed(chained)),
+        ("window engine", timed(windows.rolling_windows, df, 'Sales', sizes, stats=stats)),
+    ]
+
+
+@benchmark("topk")
+def topk_benchmark(rows):
+    df = synthetic_frame(rows)
+    return [
+        ("sort_values().head(10)", timed(lambda: df.sort_values('Sales', ascending=False).head(10))),
+        ("nlargest(10)", timed(df.nlargest, 10, 'Sales')),
+        ("top_k partial selection", timed(topk.top_k, df, 'Sales', 10)),
+        ("top 3 per store, groupby().head()", timed(
+            lambda: df.sort_values('Sales', ascending=False).groupby('Store').head(3)
+        )),
+        ("top_k_per_group, cold", timed(topk.top_k_per_group, df, 'Store', 'Sales', 3)),
+        ("top_k_per_group, cached permutation", timed(topk.top_k_per_group, df, 'Store', 'Sales', 3)),
+    ]
+
+
+def import_times(modules=APP_MODULES):
+    """Cumulative import time in seconds of every top-level module loaded
+    by a fresh interpreter importing ``modules``, from ``python -X importtime``
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Nested imports are indented; only top-level ones add to the total
+        if not name.startswith('  '):
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def first_render_time():
+    """Seconds from a cold interpreter to the app's first complete run"""
+    script = (
+        "import time; start = time.perf_counter();"
+        "from streamlit.testing.v1 import AppTest;"
+        "AppTest.from_file('pandas_learning_app.py', default_timeout=600).run();"
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+@benchmark("startup")
+def startup_benchmark(rows):
+    times = import_times()
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+    return [
+        ("cold import of the app modules", sum(times.values())),
+        *((f"  import {name}", seconds) for name, seconds in slowest),
+        ("time to first render (AppTest)", first_render_time()),
+    ]
+
+
+@benchmark("stores")
+def stores_benchmark(rows):
+    df = synthetic_frame(rows)
+    spec = {'Sales': ['count', 'mean', 'std', 'min', 'max'], 'Customers': ['mean', 'std']}
+    results = [("factorize once per dataset version", timed(categorical.factorize, df, 'Store'))]
+    for label, string_path, code_path in [
+        ("value_counts", lambda: df['Store'].value_counts(), lambda: categorical.value_counts(df)),
+        ("nunique", lambda: df['Store'].nunique(), lambda: categorical.nunique(df)),
+        ("== 'Store_0001'", lambda: df['Store'] == 'Store_0001', lambda: categorical.equals_mask(df, 'Store_0001')),
+        ("groupby('Store').agg", lambda: df.groupby('Store').agg(spec), lambda: categorical.group_agg(df, spec)),
+    ]:
+        results.append((f"{label}, strings", timed(string_path)))
+        results.append((f"{label}, codes", timed(code_path)))
+    return results
+
+
+@benchmark("dedup")
+def dedup_benchmark(rows):
+    days = 1000
+    spec = loadgen.LoadSpec(stores=max(1, rows // days), days=days, duplicate_rate=0.01)
+    df = loadgen.generate(spec, processes=1)
+    keys = ['Date', 'Store']
+
+    def chunked():
+        tracker = dedup.DuplicateTracker()
+        for start in range(0, len(df), loadgen.CHUNK_ROWS // 4):
+            tracker.add(df.iloc[start:start + loadgen.CHUNK_ROWS // 4])
+
+    return [
+        ("drop_duplicates()", timed(df.drop_duplicates)),
+        ("duplicated().sum()", timed(lambda: df.duplicated().sum())),
+        ("duplicate_report, one frame", timed(dedup.duplicate_report, df)),
+        ("DuplicateTracker, 250k-row chunks", timed(chunked)),
+        ("duplicated(['Date', 'Store']).sum()", timed(lambda: df.duplicated(keys).sum())),
+        ("duplicate_report, (Date, Store)", timed(dedup.duplicate_report, df, keys)),
+    ]
+
+
+@benchmark("boxplot")
+def boxplot_benchmark(rows):
+    from matplotlib.figure import Figure
+    from tabs import tab4_creating_viz
+
+    df = synthetic_frame(rows)
+    categorical.factorize(df, 'Store')
+
+    def seaborn_plot():
+        import seaborn as sns
+        sns.boxplot(data=df, x='Store', y='Sales', ax=Figure().subplots())
+
+    def native_plot():
+        tab4_creating_viz._draw_boxes(Figure().subplots(), categorical.box_stats(df, 'Sales'))
+
+    return [
+        ("import seaborn", timed(__import__, 'seaborn')),
+        ("sns.boxplot", timed(seaborn_plot)),
+        ("box_stats", timed(categorical.box_stats, df, 'Sales')),
+        ("box_stats + ax.bxp", timed(native_plot)),
+    ]
+
+
+# Sections whose examples derive a frame with extra columns from the dataset
+DERIVED_SECTIONS = (
+    'tab1.new_columns', 'tab2.cumulative', 'tab2.monthly_stats',
+    'tab2.pivot_complex', 'tab3.pivot_sales', 'tab4.missing_demo',
+)
+
+
+@benchmark("views")
+def views_benchmark(rows):
+    import tabs.tab1_intro, tabs.tab2_aggregating, tabs.tab3_slicing, tabs.tab4_creating_viz  # noqa: F401
+
+    df = synthetic_frame(rows)
+    examples = len(DERIVED_SECTIONS)
+
+    def deep_copy():
+        derived = df.copy()
+        derived['Month'] = derived['Date'].dt.month
+
+    def view():
+        df.assign(Month=df['Date'].dt.month)
+
+    # A rerun without cached results derives one frame per example: with
+    # deep copies that scales with examples x frame size, with views only
+    # with the derived columns
+    copy_bytes, view_bytes = allocated(deep_copy), allocated(view)
+    return [
+        ("frame size", Bytes(df.memory_usage(deep=False).sum())),
+        ("df.copy() + Month column", copy_bytes),
+        ("df.assign(Month=...) view", view_bytes),
+        (f"{examples} examples, deep copies", Bytes(examples * copy_bytes)),
+        (f"{examples} examples, views", Bytes(examples * view_bytes)),
+        *((f"  peak computing {section_id}", allocated(sections.compute_uncached, section_id, df))
+          for section_id in DERIVED_SECTIONS),
+    ]
+
+
+# Sections that only make sense on the sample's shape: a date slice over one
+# row per date, and a scatter of the sample's Store_A
+SAMPLE_ONLY_SECTIONS = ('tab3.date_slice', 'tab4.scatter_plot')
+
+
+@benchmark("backends")
+def backends_benchmark(rows):
+    import tabs.tab0_download, tabs.tab1_intro, tabs.tab2_aggregating, tabs.tab3_slicing, tabs.tab4_creating_viz  # noqa: F401
+    from streamlit import dataframe_util
+
+    frames = {backend: dataset.with_backend(synthetic_frame(rows), backend) for backend in ('numpy', 'pyarrow')}
+    results = []
+    for backend, df in frames.items():
+        results += [
+            (f"st.dataframe Arrow handoff, {backend}", timed(dataframe_util.convert_pandas_df_to_arrow_bytes, df)),
+            (f"== 'Store_0001', {backend}", timed(lambda: df['Store'] == 'Store_0001')),
+            (f"value_counts, {backend}", timed(lambda: df['Store'].value_counts())),
+            (f"to_csv, {backend}", timed(dataset.to_csv, df)),
+        ]
+    # Every dataset-only section, computed directly so no cache answers it;
+    # a section that raises under either backend is reported as failed
+    for section_id in sections.section_ids(persisted_only=True):
+        if section_id in SAMPLE_ONLY_SECTIONS:
+            continue
+        for backend, df in frames.items():
+            try:
+                value = timed(sections.compute_uncached, section_id, df)
+            except Exception as exc:
+                value = Failed(f"{type(exc).__name__}: {exc}")
+            results.append((f"{section_id}, {backend}", value))
+    return results
+
+
+@benchmark("compare")
+def compare_benchmark(rows):
+    import tabs.tab2_aggregating, tabs.tab4_creating_viz  # noqa: F401
+
+    days = 1000
+    stores = max(1, rows // days)
+    current = loadgen.generate(loadgen.LoadSpec(stores=stores, days=days, seed=1), processes=1)
+    baseline = loadgen.generate(loadgen.LoadSpec(stores=stores, days=days, seed=2), processes=1)
+
+    def aggregates(df):
+        return {section_id: sections.compute_uncached(section_id, df) for section_id, _, _ in compare.COMPARISONS}
+
+    start = time.perf_counter()
+    current_results = aggregates(current)
+    one = time.perf_counter() - start
+    start = time.perf_counter()
+    baseline_results = aggregates(baseline)
+    other = time.perf_counter() - start
+
+    def diffs():
+        for section_id, _, _ in compare.COMPARISONS:
+            compare.diff(
+                compare.table(section_id, current_results[section_id]),
+                compare.table(section_id, baseline_results[section_id])
+            )
+
+    return [
+        ("aggregates, current version", one),
+        ("aggregates, baseline version", other),
+        ("aligned diffs of the cached aggregates", timed(diffs)),
+    ]
@@ -0,0 +1,99 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+
+from core.config import CACHE_DIR, CACHE_MAX_BYTES
+
+# One SQLite database per host, shared by every app process that points at
+# the same cache directory
+DB_PATH = CACHE_DIR / "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+# Seconds between LRU timestamp refreshes for the same entry
+_TOUCH_INTERVAL = 60
+
+_local = threading.local()
+
+# Sentinel returned by load() so that None stays a valid cached value
+MISSING = object()
+
+def result_key(token, operation):
+    """Content-addressed key for an operation applied to a dataset version"""
+    return hashlib.sha256(f"{token}:{operation}".encode()).hexdigest()
+
+
+def _connection():
+    # sqlite3 connections must not be shared between threads
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+        # WAL lets every replica on the host read while one of them writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        _local.conn = conn
+    return conn
+
+
+def load(key):
+    """Read a persisted result, or MISSING if there is none"""
+    conn = _connection()
+    row = conn.execute(
+        "SELECT value, last_access FROM results WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        return MISSING
+    now = time.time()
+    # Only touch the LRU clock occasionally so hot reads stay read-only
+    if now - row[1] > _TOUCH_INTERVAL:
+        conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+    try:
+        return pickle.loads(row[0])
+    except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return MISSING
+
+
+def store(key, value):
+    """Persist a result and evict least recently used entries over budget"""
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    conn = _connection()
+    # A single transaction makes the write and the eviction atomic for
+    # every other process reading the same database
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob), time.time())
+        )
+        conn.execute("""
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running
+                    FROM results
+                ) WHERE running > ?
+            )
+        """, (CACHE_MAX_BYTES,))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def size():
+    """Total bytes and number of entries currently stored"""
+    total, count = _connection().execute(
+        "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM results"
+    ).fetchone()
+    return total, count
@@ -0,0 +1,260 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.fingerprint import fingerprint
+
+# Factorizations kept per (dataset version, column)
+CODES_CACHE_SIZE = 16
+
+# Aggregations group_agg can answer from integer codes
+AGGREGATIONS = ('count', 'sum', 'mean', 'std', 'min', 'max')
+
+# Shared by every session and the background section workers
+_factorized_lock = threading.Lock()
+_factorized = OrderedDict()
+
+
+class Codes:
+    """Integer codes of one categorical column
+
+    ``codes[i]`` indexes ``uniques`` (sorted, as groupby orders them) and is -1
+    for missing values; ``first_seen`` orders the uniques by first appearance,
+    which is how value_counts breaks ties. For a pandas Categorical column
+    the uniques are all of its categories, used or not, in category order.
+    """
+
+    def __init__(self, codes, uniques, first_seen):
+        self.codes = codes
+        self.uniques = uniques
+        self.first_seen = first_seen
+        self.has_missing = bool((codes < 0).any())
+        self._grouping = None
+
+    def code_of(self, value):
+        return self.uniques.get_indexer([value])[0]
+
+    def grouping(self):
+        """Row order that groups rows by code, and each group's start
+
+        Computed lazily once; small code ranges are radix-sorted by NumPy.
+        """
+        if self._grouping is None:
+            codes = self.codes
+            if len(self.uniques) < np.iinfo(np.int16).max:
+                codes = codes.astype(np.int16)
+            order = np.argsort(codes, kind='stable')
+            if self.has_missing:
+                order = order[self.codes[order] >= 0]
+            counts = np.bincount(self.codes[order], minlength=len(self.uniques))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            self._grouping = (order, starts, counts)
+        return self._grouping
+
+
+def factorize(df, column='Store'):
+    """Codes for df[column], computed once per dataset version"""
+    key = (fingerprint(df), column)
+    with _factorized_lock:
+        if key in _factorized:
+            _factorized.move_to_end(key)
+            return _factorized[key]
+
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # pandas orders and breaks ties by category, and counts unused ones
+        codes = values.cat.codes.to_numpy().astype(np.int64)
+        uniques = pd.CategoricalIndex(values.cat.categories, dtype=values.dtype)
+        first_seen = np.arange(len(uniques))
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        valid = codes >= 0
+        # Position of each unique's first row, to recover appearance order
+        first_row = np.full(len(uniques), len(codes), dtype=np.int64)
+        np.minimum.at(first_row, codes[valid], np.flatnonzero(valid))
+        first_seen = np.argsort(first_row, kind='stable')
+    result = Codes(codes, uniques.rename(column), first_seen)
+
+    with _factorized_lock:
+        # Another thread may have factorized the same column meanwhile
+        result = _factorized.setdefault(key, result)
+        _factorized.move_to_end(key)
+        if len(_factorized) > CODES_CACHE_SIZE:
+            _factorized.popitem(last=False)
+    return result
+
+
+def _counts(codes):
+    valid = codes.codes[codes.codes >= 0] if codes.has_missing else codes.codes
+    return np.bincount(valid, minlength=len(codes.uniques))
+
+
+def nunique(df, column='Store'):
+    """Same as ``df[column].nunique()``"""
+    return int(np.count_nonzero(_counts(factorize(df, column))))
+
+
+def value_counts(df, column='Store', normalize=False):
+    """Same as ``df[column].value_counts(normalize=normalize)``"""
+    codes = factorize(df, column)
+    counts = _counts(codes)[codes.first_seen]
+    order = np.argsort(-counts, kind='stable')
+    index = codes.uniques[codes.first_seen[order]]
+    if normalize:
+        return pd.Series(counts[order] / counts.sum(), index=index, name='proportion')
+    return pd.Series(counts[order], index=index, name='count')
+
+
+def equals_mask(df, value, column='Store'):
+    """Same as ``(df[column] == value).to_numpy()``, as an integer compare"""
+    codes = factorize(df, column)
+    code = codes.code_of(value)
+    if code < 0:
+        return np.zeros(len(df), dtype=bool)
+    return codes.codes == code
+
+
+def _group_values(codes, values, aggs):
+    # Requested aggregations of one numeric column per group, sharing the
+    # masks, counts and sums between them
+    size = len(codes.uniques)
+    missing = pd.isna(values)
+    if codes.has_missing or missing.any():
+        valid = (codes.codes >= 0) & ~missing
+        group, data = codes.codes[valid], values[valid]
+    else:
+        group, data = codes.codes, values
+
+    out = {}
+    count = np.bincount(group, minlength=size)
+    total = np.bincount(group, weights=data, minlength=size) if set(aggs) - {'count', 'min', 'max'} else None
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count if total is not None else None
+        for agg in aggs:
+            if agg == 'count':
+                out[agg] = count
+            elif agg == 'sum':
+                out[agg] = total.astype(values.dtype) if values.dtype.kind in 'iu' else total
+            elif agg == 'mean':
+                out[agg] = mean
+            elif agg == 'std':
+                # Two-pass variance for the same accuracy as pandas
+                squares = np.bincount(group, weights=(data - mean[group]) ** 2, minlength=size)
+                out[agg] = np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
+            elif agg in ('min', 'max'):
+                out[agg] = _group_extreme(codes, values, missing, count, agg)
+            else:
+                raise ValueError(f"Unsupported aggregation {agg!r}, expected one of {AGGREGATIONS}")
+    return out
+
+
+def _group_extreme(codes, values, missing, count, agg):
+    # Min/max per group from one reduceat over the rows in grouped order;
+    # missing values are replaced by the reduction's identity
+    order, starts, _ = codes.grouping()
+    grouped = values[order]
+    if missing.any():
+        grouped = np.where(missing[order], np.inf if agg == 'min' else -np.inf, grouped)
+    if not len(grouped):
+        return np.full(len(starts), np.nan)
+    ufunc = np.minimum if agg == 'min' else np.maximum
+    out = ufunc.reduceat(grouped, np.minimum(starts, len(grouped) - 1))
+    # Groups without a single value are NaN, as in pandas
+    return out if count.all() else np.where(count > 0, out, np.nan)
+
+
+def group_agg(df, spec, column='Store'):
+    """Same as ``df.groupby(column, observed=True).agg(spec)`` for numeric columns
+
+    ``spec`` maps a column to one aggregation name or a list of them; lists
+    give MultiIndex columns exactly like pandas. Categories without rows
+    are left out.
+    """
+    codes = factorize(df, column)
+    result = {}
+    multi = any(isinstance(aggs, list) for aggs in spec.values())
+    for value_column, aggs in spec.items():
+        aggs = aggs if isinstance(aggs, list) else [aggs]
+        computed = _group_values(codes, df[value_column].to_numpy(), aggs)
+        for agg in aggs:
+            result[(value_column, agg) if multi else value_column] = computed[agg]
+    table = pd.DataFrame(result, index=codes.uniques)
+    observed = _counts(codes) > 0
+    return table if observed.all() else table[observed]
+
+
+def group_sum(df, value, column='Store'):
+    """Same as ``df.groupby(column)[value].sum()``"""
+    return group_agg(df, {value: 'sum'}, column)[value]
+
+
+def group_mean(df, value, column='Store'):
+    """Same as ``df.groupby(column)[value].mean()``"""
+    return group_agg(df, {value: 'mean'}, column)[value]
+
+
+def _lerp(low, high, fraction):
+    # np.percentile's linear interpolation, for bit-identical quartiles
+    return np.where(
+        fraction >= 0.5,
+        high - (high - low) * (1 - fraction),
+        low + (high - low) * fraction
+    )
+
+
+def box_stats(df, value, column='Store', whis=1.5):
+    """Per-group box plot statistics, ready for ``ax.bxp``
+
+    Same quartiles, whiskers and fliers as ``matplotlib.cbook.boxplot_stats``
+    on each group's values (NaNs dropped; means agree to rounding), from one
+    sort of all rows by code and value.
+    Groups come in order of first appearance, as seaborn draws them.
+    """
+    codes = factorize(df, column)
+    values = df[value].to_numpy(dtype='float64')
+    keep = (codes.codes >= 0) & ~np.isnan(values)
+    group, data = codes.codes[keep], values[keep]
+    # Sort by value, then stably by code: two plain sorts are several times
+    # faster than np.lexsort, and the code pass is a radix sort
+    order = np.argsort(data)
+    narrow = group.astype(np.int16) if len(codes.uniques) < np.iinfo(np.int16).max else group
+    order = order[np.argsort(narrow[order], kind='stable')]
+    group, data = group[order], data[order]
+    if not len(data):
+        return []
+
+    counts = np.bincount(group, minlength=len(codes.uniques))
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    def quantile(q):
+        position = starts + q * (counts - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + counts - 1)
+        return _lerp(data[low], data[high], position - low)
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    # Row i belongs to the slot[i]-th present group
+    slot = np.repeat(np.arange(len(present)), counts)
+    low_reach = np.minimum.reduceat(np.where(data >= (q1 - whis * iqr)[slot], data, np.inf), starts)
+    high_reach = np.maximum.reduceat(np.where(data <= (q3 + whis * iqr)[slot], data, -np.inf), starts)
+    whislo = np.where(np.isinf(low_reach) | (low_reach > q1), q1, low_reach)
+    whishi = np.where(np.isinf(high_reach) | (high_reach < q3), q3, high_reach)
+
+    is_flier = (data < whislo[slot]) | (data > whishi[slot])
+    fliers = np.split(data[is_flier], np.cumsum(np.bincount(slot[is_flier], minlength=len(present)))[:-1])
+    means = np.add.reduceat(data, starts) / counts
+
+    stats = {
+        code: {
+            'label': codes.uniques[code], 'mean': means[i], 'iqr': iqr[i],
+            'q1': q1[i], 'med': median[i], 'q3': q3[i],
+            'whislo': whislo[i], 'whishi': whishi[i], 'fliers': fliers[i],
+        }
+        for i, code in enumerate(present)
+    }
+    return [stats[code] for code in codes.first_seen if code in stats]
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from core import sections
+
+# Aggregate sections worth comparing between two dataset versions, as
+# (section id, title, function picking the label-indexed table out of the
+# cached result, or None when the result is the table)
+COMPARISONS = (
+    ("summary.stats", "Summary statistics",
+     lambda result: result['describe'].select_dtypes('number')),
+    ("tab2.store_counts", "Rows per store", None),
+    ("tab2.grouped_stats", "Sales and customers by store", None),
+    ("tab2.sales_percentage", "Share of total sales by store (%)", None),
+    ("tab2.monthly_stats", "Monthly averages by store", None),
+    ("tab2.pivot_complex", "Store x month pivot", None),
+    ("tab4.missing_values", "Missing values per column", lambda result: result['counts']),
+)
+
+# Column groups of a diff table, in display order
+MEASURES = ('Current', 'Baseline', 'Change', 'Change %')
+
+
+def table(section_id, result):
+    """The label-indexed table compared for a section's cached result"""
+    for compared_id, _, pick in COMPARISONS:
+        if compared_id == section_id:
+            return result if pick is None else pick(result)
+    raise KeyError(f"{section_id} is not a compared section")
+
+
+def diff(current, baseline):
+    """Current and baseline values side by side with their change
+
+    Both tables are aligned on their labels first, so a store or month
+    present in only one version shows up with blank changes instead of
+    shifting the other rows. Change % is relative to the baseline and
+    blank where the baseline is zero.
+    """
+    if isinstance(current, pd.Series):
+        current, baseline = current.to_frame(), baseline.to_frame()
+    current, baseline = current.align(baseline, join='outer')
+    change = current - baseline
+    percent = (change / baseline.abs() * 100).replace([np.inf, -np.inf], np.nan).round(2)
+    return pd.concat(dict(zip(MEASURES, (current, baseline, change, percent))), axis=1)
+
+
+def compare(section_id, current, baseline):
+    """Diff of one section between two datasets, from the shared caches
+
+    Each version's aggregate is computed at most once and then served from
+    the session memo or disk cache; only the aligned arithmetic on the two
+    small results runs on every call.
+    """
+    return diff(
+        table(section_id, sections.get(section_id, current)),
+        table(section_id, sections.get(section_id, baseline)),
+    )
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+# Root directory for everything the app persists between processes
+# (precomputed section results, spilled datasets, logs). Override with
+# PANDAS_HUB_CACHE_DIR to share one cache between several replicas.
+CACHE_DIR = Path(os.environ.get(
+    "PANDAS_HUB_CACHE_DIR",
+    Path(__file__).resolve().parent.parent / ".cache"
+))
+
+# Datasets written by `python main.py generate` into subdirectories of this
+# directory can be picked in the app, e.g. this week's and last week's extract.
+DATASETS_DIR = Path(os.environ.get(
+    "PANDAS_HUB_DATASETS_DIR",
+    Path(__file__).resolve().parent.parent / "datasets"
+))
+
+# Upper bound on the on-disk result cache; least recently used entries are
+# evicted once the stored results exceed it.
+CACHE_MAX_BYTES = int(os.environ.get("PANDAS_HUB_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# Cache keys use a sampled fingerprint of unstamped frames by default; set
+# PANDAS_HUB_FULL_FINGERPRINT=1 to hash every column buffer instead.
+FULL_FINGERPRINT = os.environ.get("PANDAS_HUB_FULL_FINGERPRINT", "0") == "1"
+
+# Memory budget for shared datasets (generated variants, uploads); least
+# recently used ones beyond it are spilled to CACHE_DIR/datasets as Parquet.
+DATASET_CACHE_MAX_BYTES = int(os.environ.get("PANDAS_HUB_DATASET_CACHE_MB", "512")) * 1024 * 1024
+
+# Section results each session keeps in st.session_state for instant reruns
+SESSION_MEMO_SIZE = int(os.environ.get("PANDAS_HUB_SESSION_MEMO_SIZE", "256"))
+
+# Heavy sections are computed on background threads and rendered into
+# placeholders as they finish; PANDAS_HUB_BACKGROUND_SECTIONS=0 renders them
+# inline instead. Workers are shared by every session of the process.
+BACKGROUND_SECTIONS = os.environ.get("PANDAS_HUB_BACKGROUND_SECTIONS", "1") == "1"
+BACKGROUND_WORKERS = int(os.environ.get("PANDAS_HUB_BACKGROUND_WORKERS", "4"))
+
+# Column storage of the datasets the app loads or generates: "numpy" (the
+# default) or "pyarrow" for Arrow-backed dtypes (string[pyarrow],
+# timestamp[ns][pyarrow], ...), which st.dataframe receives without a copy.
+DTYPE_BACKEND = os.environ.get("PANDAS_HUB_DTYPE_BACKEND", "numpy")
+if DTYPE_BACKEND not in ("numpy", "pyarrow"):
+    raise ValueError(f"PANDAS_HUB_DTYPE_BACKEND must be 'numpy' or 'pyarrow', not {DTYPE_BACKEND!r}")
+
+# Rerun latency: the admin view's percentiles cover the last
+# PANDAS_HUB_LATENCY_WINDOW reruns of the process, and reruns slower than
+# PANDAS_HUB_SLOW_RERUN_SECONDS (the latency SLO) are written with their
+# section breakdown to CACHE_DIR/logs/slow_reruns.jsonl.
+LATENCY_WINDOW = int(os.environ.get("PANDAS_HUB_LATENCY_WINDOW", "1000"))
+SLOW_RERUN_SECONDS = float(os.environ.get("PANDAS_HUB_SLOW_RERUN_SECONDS", "2.0"))
+
+# Process-wide admin views (rerun latency of every session) are only shown
+# when PANDAS_HUB_ADMIN=1; they stay hidden from visitors by default.
+ADMIN = os.environ.get("PANDAS_HUB_ADMIN", "0") == "1"
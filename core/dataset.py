@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from core.config import DATASETS_DIR, DTYPE_BACKEND
+from core.fingerprint import stamp
+
+# Bump whenever the generator below changes the data it produces, so that
+# results cached under the previous version token are not reused
+SAMPLE_DATA_VERSION = 1
+
+
+def with_backend(df, backend=DTYPE_BACKEND):
+    """df with Arrow-backed columns for the "pyarrow" backend, else as is"""
+    if backend == "numpy":
+        return df
+    import pyarrow as pa
+
+    # Plain string rather than large_string, which st.dataframe would
+    # otherwise downcast column by column
+    return df.convert_dtypes(dtype_backend="pyarrow").astype({
+        column: pd.ArrowDtype(pa.string()) for column, dtype in df.dtypes.items()
+        if pd.api.types.is_string_dtype(dtype) or dtype == object
+    })
+
+
+def to_csv(df):
+    """``df.to_csv(index=False)``, formatted the same for either backend"""
+    # NumPy datetimes drop the time of day when every value is midnight,
+    # Arrow timestamps always print it; format those as NumPy ones
+    timestamps = {
+        column: dtype.numpy_dtype for column, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.ArrowDtype) and dtype.numpy_dtype.kind == 'M'
+    }
+    return (df.astype(timestamps) if timestamps else df).to_csv(index=False)
+
+
+def version_token(name, backend=DTYPE_BACKEND):
+    """Dataset version token, distinct per backend so cached results of one
+    are never served for the other"""
+    return name if backend == "numpy" else f"{name}-{backend}"
+
+
+def generate_sample_data(backend=DTYPE_BACKEND, weeks_ago=0):
+    """Generate a sample dataset with 50 rows and 4 meaningful features
+
+    ``weeks_ago`` gives an earlier extract of the same stores: its dates
+    start that many weeks before, with different draws.
+    """
+    # A private RandomState draws the same values as seeding the global one,
+    # without resetting the global RNG under other sessions' feet
+    rng = np.random.RandomState(42 + weeks_ago)
+    
+    # Generate dates for 50 consecutive days
+    start_date = datetime(2024, 1, 1) - timedelta(weeks=weeks_ago)
+    dates = [start_date + timedelta(days=i) for i in range(50)]
+    
+    # Generate store data
+    stores = rng.choice(['Store_A', 'Store_B', 'Store_C', 'Store_D', 'Store_E'], 50)
+    
+    # Generate sales data (correlated with store type)
+    store_multipliers = {'Store_A': 1.2, 'Store_B': 1.0, 'Store_C': 0.8, 'Store_D': 1.5, 'Store_E': 0.9}
+    base_sales = rng.normal(3000, 500, 50)
+    sales = [max(1000, base_sales[i] * store_multipliers[stores[i]]) for i in range(50)]
+    
+    # Generate customer data (correlated with sales)
+    customers = [max(50, int(sale/25 + rng.normal(0, 10))) for sale in sales]
+    
+    # Create DataFrame
+    data = {
+        'Date': dates,
+        'Store': stores,
+        'Sales': [round(s, 2) for s in sales],
+        'Customers': customers
+    }
+    
+    df = with_backend(pd.DataFrame(data), backend)
+    name = f"sample-v{SAMPLE_DATA_VERSION}" + (f"-{weeks_ago}w" if weeks_ago else "")
+    return stamp(df, version_token(name, backend))
+
+
+def sources():
+    """Datasets the app can load, as label -> (registry name, factory)
+
+    The built-in sample and its previous week, plus every directory under
+    DATASETS_DIR written by ``python main.py generate``.
+    """
+    from core import loadgen
+
+    found = {
+        "Sample": ("sample", generate_sample_data),
+        "Sample, previous week": ("sample-1w", partial(generate_sample_data, weeks_ago=1)),
+    }
+    for manifest in sorted(DATASETS_DIR.glob(f"*/{loadgen.MANIFEST}")):
+        directory = manifest.parent
+        found[directory.name] = (f"parquet:{directory}", partial(loadgen.read_parquet, directory))
+    return found
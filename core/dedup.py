@@ -0,0 +1,145 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Rows read per batch when scanning Parquet files
+BATCH_ROWS = 1_000_000
+
+
+def row_hashes(df, subset=None):
+    """64-bit hash of every row (or of the subset columns), index ignored
+
+    Two rows with equal values always hash equal, NaNs included, so equal
+    hashes stand in for equal rows. Distinct rows colliding is possible but
+    rare: about a 1 in 4,000 chance of a single false duplicate at 100M rows.
+    """
+    frame = df if subset is None else df[list(subset)]
+    # Categoricals hash each category once and spread it by code, giving the
+    # same hashes as the strings themselves several times faster for
+    # repetitive keys like Store
+    strings = {
+        column: 'category' for column, dtype in frame.dtypes.items()
+        if pd.api.types.is_string_dtype(dtype)
+    }
+    if strings:
+        frame = frame.astype(strings)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _repeats(hashes):
+    # Same as pd.Series(hashes).duplicated(): a plain sort finds the repeated
+    # values, and only rows holding one of those need their order resolved
+    ordered = np.sort(hashes)
+    repeated = np.unique(ordered[1:][ordered[1:] == ordered[:-1]])
+    duplicated = np.zeros(len(hashes), dtype=bool)
+    if not len(repeated):
+        return duplicated
+    positions = np.searchsorted(repeated, hashes).clip(max=len(repeated) - 1)
+    candidates = np.flatnonzero(repeated[positions] == hashes)
+    _, first = np.unique(hashes[candidates], return_index=True)
+    duplicated[candidates] = True
+    duplicated[candidates[first]] = False
+    return duplicated
+
+
+class DuplicateTracker:
+    """Exact-duplicate detection over a stream of appended chunks
+
+    Keeps one uint64 hash per distinct row seen so far, as a few sorted runs
+    merged like a binary counter, so memory is 8 bytes per distinct row
+    (800 MB at 100M) and adding n rows in total costs O(n log n). Nothing
+    else about earlier chunks is kept besides a small sample of duplicates.
+    """
+
+    def __init__(self, subset=None, sample_size=5):
+        self.subset = None if subset is None else list(subset)
+        self.sample_size = sample_size
+        self.rows = 0
+        self.duplicates = 0
+        self._runs = []
+        self._samples = []
+
+    def _seen(self, hashes):
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            seen |= run[positions] == hashes
+        return seen
+
+    def _remember(self, hashes):
+        # An empty run would break the searchsorted lookups in _seen
+        if not len(hashes):
+            return
+        run = np.sort(hashes)
+        # Merge equal-sized neighbours so there are only O(log n) runs
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self._runs.pop(), run]), kind='mergesort')
+        self._runs.append(run)
+
+    def add(self, chunk):
+        """Mask of the chunk's rows already seen in it or an earlier chunk"""
+        hashes = row_hashes(chunk, self.subset)
+        duplicated = _repeats(hashes)
+        is_first = ~duplicated
+        if self._runs:
+            duplicated[is_first] = self._seen(hashes[is_first])
+        self._remember(hashes[~duplicated])
+
+        found = int(duplicated.sum())
+        self.rows += len(chunk)
+        self.duplicates += found
+        missing_samples = self.sample_size - sum(len(sample) for sample in self._samples)
+        if found and missing_samples > 0:
+            self._samples.append(chunk[duplicated].head(missing_samples))
+        return duplicated
+
+    @property
+    def unique(self):
+        return self.rows - self.duplicates
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+    def samples(self):
+        """Up to sample_size duplicate rows, in the order they were found"""
+        if not self._samples:
+            return pd.DataFrame()
+        return pd.concat(self._samples)
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'duplicates': self.duplicates,
+            'unique': self.unique,
+            'samples': self.samples(),
+        }
+
+
+def duplicate_report(df, subset=None, sample_size=5):
+    """Duplicate count and samples for one frame, like df.duplicated(subset)
+
+    Unlike ``drop_duplicates`` this never builds the deduplicated frame.
+    """
+    tracker = DuplicateTracker(subset, sample_size)
+    tracker.add(df)
+    return tracker.report()
+
+
+def scan_parquet(path, subset=None, sample_size=5, batch_rows=BATCH_ROWS):
+    """Duplicate report over Parquet files read one batch at a time
+
+    ``path`` is a file or a directory of parts, e.g. one written by
+    ``python main.py generate``; memory is one batch plus the hashes. Only
+    the subset columns are read, so samples carry only those.
+    """
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    files = sorted(path.glob("*.parquet")) if path.is_dir() else [path]
+    tracker = DuplicateTracker(subset, sample_size)
+    for file in files:
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=batch_rows, columns=subset):
+            tracker.add(batch.to_pandas())
+    return tracker.report()
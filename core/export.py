@@ -0,0 +1,137 @@
+import hashlib
+import io
+import json
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from core import cache, sections
+from core.fingerprint import fingerprint
+
+MANIFEST = "manifest.json"
+
+_SCALARS = (str, int, float, bool, np.generic, pd.Timestamp, pd.Timedelta)
+
+
+def _name(section_id, params):
+    # Widget-driven results get a short, stable suffix for their params
+    if not params:
+        return section_id
+    digest = hashlib.sha256(repr(sorted(params.items())).encode()).hexdigest()[:8]
+    return f"{section_id}@{digest}"
+
+
+def _parts(value, name):
+    # Split a section result into (part name, DataFrame or PNG bytes);
+    # containers become one part per non-scalar entry
+    if isinstance(value, pd.DataFrame):
+        yield name, value
+    elif isinstance(value, pd.Series):
+        yield name, value.to_frame(value.name if value.name is not None else 'value')
+    elif isinstance(value, bytes):
+        yield name, value
+    elif isinstance(value, dict):
+        # Scalar entries share one single-row table
+        scalars = {key: item for key, item in value.items() if isinstance(item, _SCALARS)}
+        if scalars:
+            yield name, pd.DataFrame([scalars])
+        for key, item in value.items():
+            if key not in scalars:
+                yield from _parts(item, f"{name}/{key}")
+    elif isinstance(value, (tuple, list)) and all(isinstance(item, _SCALARS) for item in value):
+        yield name, pd.DataFrame({'value': list(value)})
+    elif isinstance(value, (tuple, list)):
+        for position, item in enumerate(value):
+            yield from _parts(item, f"{name}/{position}")
+    elif isinstance(value, _SCALARS):
+        yield name, pd.DataFrame({'value': [value]})
+    else:
+        raise TypeError(f"{type(value).__name__} is not tabular")
+
+
+def _parquet(frame):
+    import pyarrow as pa
+
+    frame = frame.copy(deep=False)
+    # Parquet wants string column names
+    frame.columns = [
+        ' | '.join(map(str, column)) if isinstance(column, tuple) else str(column)
+        for column in frame.columns
+    ]
+    try:
+        return frame.to_parquet(index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns (e.g. describe() of a datetime column)
+        mixed = frame.select_dtypes(include='object').columns
+        return frame.astype({column: str for column in mixed}).to_parquet(index=True)
+
+
+def collect(df, results=None):
+    """Every available result for df, without computing anything
+
+    ``results`` is a snapshot from ``sections.session_results``; persisted
+    sections missing from it are read from the disk cache.
+    """
+    collected = {(section_id, tuple(sorted(params.items()))): value
+                 for section_id, params, value in results or []}
+    for section_id in sections.section_ids(persisted_only=True):
+        if (section_id, ()) not in collected:
+            value = sections.stored(section_id, df)
+            if value is not cache.MISSING:
+                collected[(section_id, ())] = value
+    return [(section_id, dict(params), value) for (section_id, params), value in collected.items()]
+
+
+def write_bundle(df, target, results=None):
+    """Write a zip of one Parquet table per section result plus a manifest
+
+    Figures are stored as PNG files next to the tables. Sections that have
+    no cached result yet, or whose result is not tabular, are listed in the
+    manifest as skipped.
+    """
+    manifest = {
+        'dataset': fingerprint(df),
+        'code_version': sections.CODE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'tables': [],
+        'figures': [],
+        'skipped': [],
+    }
+    exported = set()
+    # Parquet and PNG are already compressed
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_STORED) as bundle:
+        for section_id, params, value in sorted(collect(df, results), key=lambda item: item[0]):
+            exported.add(section_id)
+            name = _name(section_id, params)
+            try:
+                parts = list(_parts(value, name))
+            except TypeError as error:
+                manifest['skipped'].append({'section': section_id, 'params': params, 'reason': str(error)})
+                continue
+            for part, data in parts:
+                entry = {'section': section_id, 'params': params, 'part': part}
+                if isinstance(data, bytes):
+                    entry['file'] = f"figures/{part}.png"
+                    bundle.writestr(entry['file'], data)
+                    manifest['figures'].append(entry)
+                else:
+                    entry.update(file=f"tables/{part}.parquet", rows=len(data), columns=len(data.columns))
+                    bundle.writestr(entry['file'], _parquet(data))
+                    manifest['tables'].append(entry)
+        for section_id in sections.section_ids():
+            if section_id not in exported:
+                manifest['skipped'].append({'section': section_id, 'params': {}, 'reason': "not computed yet"})
+        bundle.writestr(
+            MANIFEST, json.dumps(manifest, indent=2, default=str),
+            compress_type=zipfile.ZIP_DEFLATED
+        )
+    return manifest
+
+
+def bundle_bytes(df, results=None):
+    """The bundle as bytes, the form st.download_button's data callable must return"""
+    target = io.BytesIO()
+    write_bundle(df, target, results)
+    return target.getvalue()
@@ -0,0 +1,75 @@
+import hashlib
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from core.config import FULL_FINGERPRINT
+
+try:
+    import xxhash
+except ImportError:  # optional, only speeds up full fingerprints
+    xxhash = None
+
+# Rows hashed by the sampled fingerprint, spread evenly over the frame
+SAMPLE_ROWS = 4096
+
+# id(df) -> (weakref to df, full flag or None for stamped tokens, token);
+# fingerprinting once per frame object keeps repeated section lookups on the
+# same rerun cheap
+_tokens = {}
+
+
+def _signature(df):
+    return (df.shape, tuple(map(str, df.columns)), tuple(map(str, df.dtypes)))
+
+
+def _remember(df, full, token):
+    _tokens[id(df)] = (weakref.ref(df, lambda _, key=id(df): _tokens.pop(key, None)), full, token)
+
+
+def stamp(df, version):
+    """Attach a version token to a frame created by the generator or loader
+
+    The token belongs to this frame object only: frames derived from it
+    (sorted, filled, assigned, ...) are hashed like any other frame. It is
+    not kept in attrs, which pandas copies onto derived frames.
+    """
+    _remember(df, None, str(version))
+    return df
+
+
+def fingerprint(df, full=None):
+    """Cheap version token for a DataFrame, stable across processes"""
+    full = FULL_FINGERPRINT if full is None else full
+    entry = _tokens.get(id(df))
+    if entry is not None and entry[0]() is df and entry[1] in (None, full):
+        return entry[2]
+    token = full_hash(df) if full else sampled_hash(df)
+    _remember(df, full, token)
+    return token
+
+
+def sampled_hash(df):
+    """Hash of shape, columns, dtypes and an evenly spaced row sample"""
+    digest = hashlib.blake2b(repr(_signature(df)).encode(), digest_size=8)
+    if len(df):
+        positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), SAMPLE_ROWS)).astype(np.int64))
+        sample_hashes = pd.util.hash_pandas_object(df.iloc[positions], index=True).values
+        digest.update(sample_hashes.tobytes())
+    return "s" + digest.hexdigest()
+
+
+def full_hash(df):
+    """Hash of every column buffer; uses xxhash when it is installed"""
+    digest = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    digest.update(repr(_signature(df)).encode())
+    digest.update(pd.util.hash_pandas_object(df.index).values.tobytes())
+    for _, column in df.items():
+        values = column.values
+        if isinstance(values, np.ndarray) and values.dtype != object:
+            # Fixed-width NumPy buffers (numbers, datetimes) are hashed as raw bytes
+            digest.update(np.ascontiguousarray(values).view(np.uint8).data)
+        else:
+            digest.update(pd.util.hash_pandas_object(column, index=False).values.tobytes())
+    return "f" + digest.hexdigest()
@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from core.config import CACHE_DIR, LATENCY_WINDOW, SLOW_RERUN_SECONDS
+from core.fingerprint import fingerprint
+
+# Reruns over SLOW_RERUN_SECONDS, one JSON object per line
+SLOW_LOG = CACHE_DIR / "logs" / "slow_reruns.jsonl"
+
+# Percentiles the admin view reports
+PERCENTILES = (50, 90, 95, 99)
+
+# Upper bounds in seconds of the histogram buckets
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+# Section lookups answered without computing
+HITS = ('memo', 'disk')
+
+_lock = threading.Lock()
+
+# The most recent completed reruns of every session in this process
+_reruns = deque(maxlen=LATENCY_WINDOW)
+
+_counters = {'reruns': 0, 'interrupted': 0, 'slow': 0}
+
+# The rerun being timed on this script thread
+_local = threading.local()
+
+
+class Rerun:
+    """Timings of one script run, filled in while it runs"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.phases = {}
+        self.sections = []
+        self.datasets = {}
+
+    def phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def section(self, section_id, source, seconds):
+        self.sections.append((section_id, source, seconds))
+
+    def dataset(self, role, df):
+        self.datasets[role] = {
+            'version': fingerprint(df),
+            'rows': len(df),
+            'columns': len(df.columns),
+            'bytes': int(df.memory_usage(deep=False).sum()),
+        }
+
+    def record(self):
+        total = time.perf_counter() - self._start
+        phases = dict(self.phases)
+        phases['other'] = max(total - sum(phases.values()), 0.0)
+        hits = sum(source in HITS for _, source, _ in self.sections)
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self.started)),
+            'total': total,
+            'phases': phases,
+            'hit_ratio': hits / len(self.sections) if self.sections else None,
+            'sections': [
+                {'section': section_id, 'source': source, 'seconds': round(seconds, 4)}
+                for section_id, source, seconds in self.sections
+            ],
+            'datasets': self.datasets,
+        }
+
+
+def current():
+    """The rerun being timed on this thread, or None"""
+    return getattr(_local, 'rerun', None)
+
+
+@contextmanager
+def track():
+    """Time the script run inside the block into the rolling window
+
+    Runs cut short by a rerun or stop are counted but left out of the
+    percentiles, as their time says nothing about a complete page.
+    """
+    rerun = _local.rerun = Rerun()
+    completed = False
+    try:
+        yield rerun
+        completed = True
+    finally:
+        _local.rerun = None
+        record = rerun.record()
+        slow = completed and record['total'] > SLOW_RERUN_SECONDS
+        with _lock:
+            if completed:
+                _reruns.append(record)
+                _counters['reruns'] += 1
+                _counters['slow'] += slow
+            else:
+                _counters['interrupted'] += 1
+        if slow:
+            _log_slow(record)
+
+
+@contextmanager
+def phase(name):
+    """Time a part of the current rerun, e.g. one tab; no-op outside one"""
+    rerun = current()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if rerun is not None:
+            rerun.phase(name, time.perf_counter() - start)
+
+
+def section(section_id, source, seconds):
+    """Record one section lookup of the current rerun, if any
+
+    ``source`` is where the result came from: 'memo', 'disk', 'computed'
+    or, for sections without a disk entry, 'uncached'.
+    """
+    rerun = current()
+    if rerun is not None:
+        rerun.section(section_id, source, seconds)
+
+
+def dataset(role, df):
+    """Record the shape of a dataset the current rerun shows, if any"""
+    rerun = current()
+    if rerun is not None:
+        rerun.dataset(role, df)
+
+
+def _log_slow(record):
+    # Slowest sections first, so the culprit leads the line
+    record = {**record, 'sections': sorted(record['sections'], key=lambda s: s['seconds'], reverse=True)}
+    with _lock:
+        SLOW_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(SLOW_LOG, 'a') as log:
+            log.write(json.dumps(record, default=str) + "\n")
+
+
+def snapshot():
+    """The window's reruns, oldest first"""
+    with _lock:
+        return list(_reruns)
+
+
+def percentiles(reruns=None):
+    """Latency percentiles in seconds of the total and of every phase
+
+    A dict of name -> {'count', 'p50', 'p90', 'p95', 'p99', 'max'}.
+    """
+    reruns = snapshot() if reruns is None else reruns
+    series = {'total': [record['total'] for record in reruns]}
+    for record in reruns:
+        for name, seconds in record['phases'].items():
+            series.setdefault(name, []).append(seconds)
+    result = {}
+    for name, values in series.items():
+        if not values:
+            continue
+        points = np.percentile(values, PERCENTILES)
+        result[name] = {
+            'count': len(values),
+            **{f"p{p}": float(point) for p, point in zip(PERCENTILES, points)},
+            'max': float(max(values)),
+        }
+    return result
+
+
+def histogram(reruns=None):
+    """Rerun counts per latency bucket, as label -> count"""
+    reruns = snapshot() if reruns is None else reruns
+    totals = np.array([record['total'] for record in reruns], dtype=float)
+    counts = np.bincount(np.searchsorted(BUCKETS, totals), minlength=len(BUCKETS))
+    labels = [f"≤ {bound:g}s" for bound in BUCKETS[:-1]] + [f"> {BUCKETS[-2]:g}s"]
+    return dict(zip(labels, counts.tolist()))
+
+
+def stats():
+    """Window-wide counters next to the mean section cache hit ratio"""
+    reruns = snapshot()
+    ratios = [record['hit_ratio'] for record in reruns if record['hit_ratio'] is not None]
+    with _lock:
+        counters = dict(_counters)
+    return {
+        **counters,
+        'window': len(reruns),
+        'hit_ratio': float(np.mean(ratios)) if ratios else None,
+        'slo_seconds': SLOW_RERUN_SECONDS,
+    }
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.config import DTYPE_BACKEND
+from core.dataset import version_token, with_backend
+from core.fingerprint import stamp
+
+# Rows each worker generates and writes at a time
+CHUNK_ROWS = 1_000_000
+
+# Written next to the parts; the leading underscore keeps Parquet readers
+# from treating it as data
+MANIFEST = "_manifest.json"
+
+# Relative sales by day of week, Monday first
+_WEEKLY_PROFILE = np.array([-0.10, -0.08, -0.05, 0.0, 0.08, 0.15, 0.0])
+
+
+class LoadSpec:
+    """Shape of a synthetic sales dataset for scale testing
+
+    ``stores`` stores each get one row per day for ``days`` days from
+    ``start``. ``seasonality`` scales the weekly and yearly cycles (0 turns
+    them off), ``trend`` is the yearly sales growth, and ``missing_rate`` /
+    ``duplicate_rate`` are the fractions of Sales/Customers values blanked
+    and of rows repeated verbatim. The same spec always produces the same
+    rows, whatever the number of processes.
+    """
+
+    def __init__(self, stores=1000, days=365 * 3, start='2021-01-01', seasonality=0.2,
+                 trend=0.05, missing_rate=0.0, duplicate_rate=0.0, seed=0):
+        if stores < 1 or days < 1:
+            raise ValueError("stores and days must be positive")
+        for name, rate in (('missing_rate', missing_rate), ('duplicate_rate', duplicate_rate)):
+            if not 0 <= rate < 1:
+                raise ValueError(f"{name} must be in [0, 1), got {rate}")
+        self.stores = stores
+        self.days = days
+        self.start = str(pd.Timestamp(start).date())
+        self.seasonality = seasonality
+        self.trend = trend
+        self.missing_rate = missing_rate
+        self.duplicate_rate = duplicate_rate
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @property
+    def token(self):
+        """Dataset version token, so generated frames are never hashed"""
+        payload = json.dumps(self.to_dict(), sort_keys=True).encode()
+        return "loadgen-" + hashlib.sha256(payload).hexdigest()[:16]
+
+    @property
+    def stores_per_chunk(self):
+        return max(1, CHUNK_ROWS // self.days)
+
+    @property
+    def chunks(self):
+        return -(-self.stores // self.stores_per_chunk)
+
+    @property
+    def rows(self):
+        """Rows before duplicates are added"""
+        return self.stores * self.days
+
+
+def generate_chunk(spec, index):
+    """Rows of one block of stores, all of their days in date order"""
+    # Every chunk has its own stream, so chunks are independent of each
+    # other and of how they are spread over processes
+    rng = np.random.default_rng([spec.seed, index])
+    first = index * spec.stores_per_chunk
+    store_ids = np.arange(first, min(first + spec.stores_per_chunk, spec.stores))
+    n_stores, days = len(store_ids), spec.days
+
+    dates = pd.date_range(spec.start, periods=days, freq='D')
+    day = np.arange(days)
+    # Daily multiplier shared by every store: weekly cycle, yearly season
+    # peaking in December, and compound growth
+    season = (
+        1
+        + spec.seasonality * _WEEKLY_PROFILE[dates.dayofweek.to_numpy()]
+        + spec.seasonality * np.cos(2 * np.pi * (dates.dayofyear.to_numpy() - 350) / 365.25)
+    ) * (1 + spec.trend) ** (day / 365.25)
+
+    store_scale = rng.lognormal(0, 0.35, n_stores)
+    sales = 3000 * store_scale[:, None] * season[None, :] * rng.normal(1, 0.15, (n_stores, days))
+    sales = np.maximum(sales.ravel(), 100).round(2)
+    customers = np.maximum(50, sales / 25 + rng.normal(0, 10, sales.size)).astype(np.int64)
+
+    width = len(str(spec.stores - 1))
+    names = np.array([f'Store_{i:0{width}d}' for i in store_ids])
+    chunk = pd.DataFrame({
+        'Date': np.tile(dates.values, n_stores),
+        'Store': np.repeat(names, days),
+        'Sales': sales,
+        'Customers': customers,
+    })
+
+    if spec.missing_rate:
+        for column in ('Sales', 'Customers'):
+            blank = rng.random(len(chunk)) < spec.missing_rate
+            chunk[column] = chunk[column].where(~blank)
+    if spec.duplicate_rate:
+        repeated = np.flatnonzero(rng.random(len(chunk)) < spec.duplicate_rate)
+        # Each duplicate follows its original, like a double-submitted record
+        order = np.sort(np.concatenate([np.arange(len(chunk)), repeated]), kind='stable')
+        chunk = chunk.take(order).reset_index(drop=True)
+    return chunk
+
+
+def generate(spec, processes=None):
+    """The whole dataset as one stamped frame"""
+    indices = range(spec.chunks)
+    if processes == 1 or spec.chunks == 1:
+        chunks = [generate_chunk(spec, i) for i in indices]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = list(pool.map(generate_chunk, [spec] * spec.chunks, indices))
+    return stamp(pd.concat(chunks, ignore_index=True), spec.token)
+
+
+def _write_chunk(spec, index, directory):
+    chunk = generate_chunk(spec, index)
+    chunk.to_parquet(Path(directory) / f"part-{index:05d}.parquet", index=False)
+    return len(chunk)
+
+
+def write_parquet(spec, directory, processes=None):
+    """Generate the dataset straight into a directory of Parquet files
+
+    Each process writes its own chunks, so no rows travel between processes
+    and memory stays at one chunk per worker. Returns the rows written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        rows = sum(pool.map(
+            _write_chunk, [spec] * spec.chunks, range(spec.chunks), [directory] * spec.chunks
+        ))
+    manifest = {'spec': spec.to_dict(), 'token': spec.token, 'rows': rows, 'chunks': spec.chunks}
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return rows
+
+
+def read_parquet(directory, columns=None, backend=DTYPE_BACKEND):
+    """Load a generated dataset, stamped with its spec's version token"""
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST).read_text())
+    # Arrow-backed columns are read as they are stored, without a conversion
+    options = {} if backend == "numpy" else {'dtype_backend': backend}
+    df = with_backend(pd.read_parquet(directory, columns=columns, **options), backend)
+    if columns is not None:
+        return df
+    return stamp(df, version_token(manifest['token'], backend))
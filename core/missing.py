@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+def inject_missing(df, columns, rate=0.1, seed=42):
+    """Return a working frame of df with a share of values set to NaN
+
+    Each column loses ``rate`` of its rows, on distinct rows across columns.
+    Only those columns are copied; the others stay shared with df until
+    written to. A local Generator is used so the global NumPy RNG shared by
+    concurrent sessions is left untouched.
+    """
+    rng = np.random.default_rng(seed)
+    per_column = int(round(len(df) * rate))
+    total = min(per_column * len(columns), len(df))
+    positions = rng.choice(len(df), size=total, replace=False)
+
+    working = df.copy(deep=False)
+    for i, column in enumerate(columns):
+        values = working[column].to_numpy(dtype=float, copy=True)
+        values[positions[i * per_column:(i + 1) * per_column]] = np.nan
+        working[column] = values
+    return working
+
+
+def missing_summary(frame):
+    """Counts, percentages and rows lost to dropna() from one null mask"""
+    mask = frame.isna().to_numpy()
+    counts = pd.Series(mask.sum(axis=0), index=frame.columns)
+    rows_with_missing = int(mask.any(axis=1).sum()) if mask.size else 0
+    return {
+        'counts': counts,
+        'total': int(counts.sum()),
+        'percentage': (counts / max(len(frame), 1) * 100).round(2),
+        'rows_with_missing': rows_with_missing,
+        'dropna_shape': (len(frame) - rows_with_missing, frame.shape[1]),
+    }
+
+
+def fill_missing(frame, strategies, summary=None):
+    """Fill columns in place with their 'mean' or 'median'
+
+    Returns the per-column missing counts left afterwards, derived from the
+    summary instead of re-scanning the frame.
+    """
+    summary = missing_summary(frame) if summary is None else summary
+    fill_values = {
+        column: getattr(frame[column], strategy)()
+        for column, strategy in strategies.items()
+    }
+    frame.fillna(fill_values, inplace=True)
+    remaining = summary['counts'].copy()
+    remaining[list(fill_values)] = 0
+    return remaining
@@ -0,0 +1,34 @@
+import math
+
+import streamlit as st
+
+# Rows sent to the browser per page, and the most a caller may ask for
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 1000
+
+
+def show_dataframe(frame, key, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+    """Render one page of a frame, so render cost does not grow with its size
+
+    Only ``frame.iloc`` of the visible page is serialized; frames that fit on a
+    single page are shown as they are, without pagination controls.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    total_rows = len(frame)
+    if total_rows <= page_size:
+        st.dataframe(frame, **kwargs)
+        return
+
+    pages = math.ceil(total_rows / page_size)
+    page = st.number_input(
+        f"Page (of {pages:,})",
+        min_value=1,
+        max_value=pages,
+        value=1,
+        step=1,
+        key=f"preview_page_{key}"
+    )
+    start = (int(page) - 1) * page_size
+    stop = min(start + page_size, total_rows)
+    st.dataframe(frame.iloc[start:stop], **kwargs)
+    st.caption(f"Showing rows {start + 1:,}–{stop:,} of {total_rows:,}")
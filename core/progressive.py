@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from core import cache, latency, sections
+from core.config import BACKGROUND_SECTIONS, BACKGROUND_WORKERS
+from core.fingerprint import fingerprint
+
+try:
+    # Raises Streamlit's rerun/stop exception when the user has moved on
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_run_yield_check
+except ImportError:
+    get_run_yield_check = None
+
+# How often a run waiting on background sections checks for a rerun
+POLL_SECONDS = 0.1
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="section")
+
+# Sections being computed, shared by every session:
+# (version, section id, params) -> [future, number of runs waiting on it]
+_inflight = {}
+_lock = threading.RLock()
+
+# The renderer collecting deferred sections for this script thread's run
+_local = threading.local()
+
+
+def _submit(section_id, df, params):
+    key = (fingerprint(df), section_id, tuple(sorted(params.items())))
+    with _lock:
+        entry = _inflight.get(key)
+        if entry is None or entry[0].cancelled():
+            future = _executor.submit(sections.lookup, section_id, df, **params)
+            entry = _inflight[key] = [future, 0]
+            future.add_done_callback(lambda done, key=key: _forget(key, done))
+        entry[1] += 1
+        return key, entry[0]
+
+
+def _forget(key, future):
+    with _lock:
+        if key in _inflight and _inflight[key][0] is future:
+            del _inflight[key]
+
+
+def _release(key, future):
+    # Cancel a queued computation once no run is waiting for it any more;
+    # one that already started finishes and lands in the disk cache
+    with _lock:
+        entry = _inflight.get(key)
+        if entry is None or entry[0] is not future:
+            return
+        entry[1] -= 1
+        if entry[1] == 0:
+            future.cancel()
+
+
+class Renderer:
+    """Renders heavy sections into placeholders as their results arrive
+
+    Used as a context manager around a script run: sections deferred inside
+    it get an ``st.empty`` placeholder straight away and are computed on a
+    shared thread pool, and leaving the block fills each placeholder as its
+    result completes. A rerun or stop while waiting cancels whatever has not
+    started yet.
+    """
+
+    def __init__(self, enabled=BACKGROUND_SECTIONS):
+        self.enabled = enabled
+        self._pending = []
+
+    def __enter__(self):
+        if self.enabled:
+            _local.renderer = self
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # Still current while draining, so a render can defer further sections
+        try:
+            if exc_type is None:
+                with latency.phase("background sections"):
+                    self._drain()
+        finally:
+            _local.renderer = None
+            self.cancel()
+        return False
+
+    def defer(self, section_id, df, render, **params):
+        value = sections.memoized(section_id, df, **params)
+        if value is not cache.MISSING:
+            latency.section(section_id, 'memo', 0.0)
+            render(value)
+            return
+        placeholder = st.empty()
+        placeholder.caption("⏳ Computing…")
+        key, future = _submit(section_id, df, params)
+        self._pending.append((future, key, placeholder, render, section_id, df, params, time.perf_counter()))
+
+    def _drain(self):
+        yield_check = get_run_yield_check() if get_run_yield_check else None
+        while self._pending:
+            done, _ = wait(
+                {entry[0] for entry in self._pending},
+                timeout=POLL_SECONDS, return_when=FIRST_COMPLETED
+            )
+            if yield_check is not None:
+                yield_check()
+            for entry in [entry for entry in self._pending if entry[0] in done]:
+                self._pending.remove(entry)
+                future, key, placeholder, render, section_id, df, params, deferred = entry
+                _release(key, future)
+                value, source = future.result()
+                # Seconds from deferral until the result arrived
+                latency.section(section_id, source, time.perf_counter() - deferred)
+                sections.remember(section_id, df, value, **params)
+                with placeholder.container():
+                    render(value)
+
+    def cancel(self):
+        """Give up on every section that has not been rendered"""
+        for future, key, *_ in self._pending:
+            _release(key, future)
+        self._pending = []
+
+
+def defer(section_id, df, render, **params):
+    """Render a memoized section now, or any other once its result arrives
+
+    ``render`` is called with the section's result. Outside an enabled
+    Renderer this is the same as ``render(sections.get(...))``.
+    """
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        render(sections.get(section_id, df, **params))
+    else:
+        renderer.defer(section_id, df, render, **params)
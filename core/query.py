@@ -0,0 +1,224 @@
+import ast
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.fingerprint import fingerprint
+
+try:
+    import numexpr  # noqa: F401  (pandas picks it up for engine='numexpr')
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+# Frames smaller than this are cheaper to filter with plain pandas ops
+NUMEXPR_MIN_ROWS = 100_000
+
+# Result masks kept per (dataset version, query)
+MASK_CACHE_SIZE = 64
+
+_COMPARISONS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+    ast.In: lambda a, b: a.isin(b),
+    ast.NotIn: lambda a, b: ~a.isin(b),
+}
+
+_ARITHMETIC = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Mod: lambda a, b: a % b,
+}
+
+# Shared by every session and the background section workers
+_masks_lock = threading.Lock()
+_masks = OrderedDict()
+
+
+class QueryError(ValueError):
+    """Raised when a filter expression is outside the supported language"""
+
+
+class Plan:
+    """A validated filter expression, ready to run against any frame"""
+
+    def __init__(self, text, tree, columns, numeric_only):
+        self.text = text
+        self.tree = tree
+        self.columns = columns
+        # numexpr only handles numeric columns and literals
+        self.numeric_only = numeric_only
+
+
+def _has_column(node):
+    return any(isinstance(child, ast.Name) for child in ast.walk(node))
+
+
+def _check_value(node, numeric_columns):
+    # A column, a literal, or arithmetic on numeric columns
+    if isinstance(node, (ast.Name, ast.Constant)):
+        return
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        if isinstance(node.operand, ast.Constant) and isinstance(node.operand.value, str):
+            raise QueryError("Strings cannot be negated")
+        return _check_value(node.operand, numeric_columns)
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        # Constant-only arithmetic would run in plain Python, where e.g.
+        # 'a' * 10**11 exhausts the server's memory
+        if not _has_column(node):
+            raise QueryError("Arithmetic needs a column, e.g. Sales * 2 > 5000")
+        for operand in (node.left, node.right):
+            if isinstance(operand, ast.Constant) and isinstance(operand.value, str) or (
+                isinstance(operand, ast.Name) and operand.id not in numeric_columns
+            ):
+                raise QueryError("Arithmetic is only supported on numeric columns and numbers")
+            _check_value(operand, numeric_columns)
+        return
+    raise QueryError(f"Expected a column, a literal or arithmetic, not {ast.unparse(node)!r}")
+
+
+def _check_mask(node, numeric_columns):
+    # Anything evaluating to one boolean per row
+    if isinstance(node, ast.Compare):
+        if not _has_column(node):
+            raise QueryError(f"Comparison {ast.unparse(node)!r} does not use a column")
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                if not isinstance(left, ast.Name) or not isinstance(right, (ast.List, ast.Tuple)):
+                    raise QueryError("'in' needs a column on the left and a list on the right, "
+                                     "e.g. Store in ['Store_A', 'Store_B']")
+            else:
+                _check_value(left, numeric_columns)
+                _check_value(right, numeric_columns)
+            left = right
+    elif isinstance(node, ast.BoolOp):
+        for value in node.values:
+            _check_mask(value, numeric_columns)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        _check_mask(node.operand, numeric_columns)
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        _check_mask(node.left, numeric_columns)
+        _check_mask(node.right, numeric_columns)
+    else:
+        raise QueryError(f"Expected a comparison such as Sales > 3000, not {ast.unparse(node)!r}")
+
+
+@functools.lru_cache(maxsize=128)
+def compile_query(text, columns, numeric_columns=()):
+    """Parse a filter such as ``Sales > 3000 and Store == 'Store_A'`` into a Plan
+
+    Supported: column names, number/string/bool literals, comparisons
+    (including chained ones and ``column in [literals]``), arithmetic on
+    numeric columns, ``and``/``or``/``not`` and their ``&``/``|``/``~``
+    spellings. Every operand of ``and``/``or``/``not`` must itself be a
+    comparison or a combination of them.
+    """
+    try:
+        tree = ast.parse(text.strip(), mode='eval').body
+    except SyntaxError as exc:
+        raise QueryError(f"Could not parse query: {exc.msg}") from None
+
+    used = set()
+    numeric_only = True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id not in columns:
+                raise QueryError(f"Unknown column {node.id!r}; available: {', '.join(columns)}")
+            used.add(node.id)
+            numeric_only &= node.id in numeric_columns
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str, bool)):
+                raise QueryError(f"Unsupported literal {node.value!r}")
+            numeric_only &= not isinstance(node.value, str)
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            numeric_only = False
+            if not all(isinstance(item, ast.Constant) for item in node.elts):
+                raise QueryError("Lists may only contain literals")
+        elif isinstance(node, ast.Compare):
+            numeric_only &= not any(isinstance(op, (ast.In, ast.NotIn)) for op in node.ops)
+        elif not isinstance(node, (
+            ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.Invert, ast.USub,
+            ast.BinOp, ast.BitAnd, ast.BitOr, ast.Load, *_COMPARISONS, *_ARITHMETIC
+        )):
+            raise QueryError(f"Unsupported syntax: {type(node).__name__}")
+    _check_mask(tree, numeric_columns)
+    return Plan(text, tree, tuple(sorted(used)), numeric_only)
+
+
+def _evaluate(node, df):
+    if isinstance(node, ast.Name):
+        return df[node.id]
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [item.value for item in node.elts]
+    if isinstance(node, ast.BoolOp):
+        values = [_evaluate(value, df) for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return functools.reduce(combine, values)
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate(node.operand, df)
+        return -operand if isinstance(node.op, ast.USub) else ~operand
+    if isinstance(node, ast.BinOp):
+        left, right = _evaluate(node.left, df), _evaluate(node.right, df)
+        if isinstance(node.op, ast.BitAnd):
+            return left & right
+        if isinstance(node.op, ast.BitOr):
+            return left | right
+        return _ARITHMETIC[type(node.op)](left, right)
+    if isinstance(node, ast.Compare):
+        left = _evaluate(node.left, df)
+        result = True
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _evaluate(comparator, df)
+            result = result & _COMPARISONS[type(op)](left, right)
+            left = right
+        return result
+    raise QueryError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def plan_for(text, df):
+    numeric = tuple(df.select_dtypes('number').columns)
+    return compile_query(text, tuple(df.columns), numeric)
+
+
+def mask(plan, df):
+    """Boolean row mask of a Plan over df, cached per dataset version"""
+    key = (fingerprint(df), plan.text)
+    with _masks_lock:
+        if key in _masks:
+            _masks.move_to_end(key)
+            return _masks[key]
+
+    try:
+        if HAS_NUMEXPR and plan.numeric_only and len(df) >= NUMEXPR_MIN_ROWS:
+            result = df.eval(plan.text, engine='numexpr')
+        else:
+            result = _evaluate(plan.tree, df)
+    except QueryError:
+        raise
+    except Exception as exc:
+        # Whatever the data makes of a valid plan (type mismatches, overflow,
+        # memory) is reported on the page instead of aborting the rerun
+        raise QueryError(f"Could not evaluate query: {exc}") from None
+    if np.isscalar(result):
+        result = np.full(len(df), bool(result))
+    result = pd.Series(result, index=df.index).fillna(False).to_numpy(dtype=bool)
+    result.flags.writeable = False
+
+    with _masks_lock:
+        _masks[key] = result
+        _masks.move_to_end(key)
+        if len(_masks) > MASK_CACHE_SIZE:
+            _masks.popitem(last=False)
+    return result
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.config import CACHE_DIR, DATASET_CACHE_MAX_BYTES
+from core.dataset import with_backend
+from core.fingerprint import fingerprint, stamp
+
+# Evicted datasets are written here and read back on their next use
+SPILL_DIR = CACHE_DIR / "datasets"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+
+# dataset name -> (the one read-only frame every session references, bytes),
+# least recently used first
+_datasets = OrderedDict()
+
+# dataset name -> (spilled Parquet file, version token)
+_spilled = {}
+
+# Names being written to SPILL_DIR right now, outside the lock
+_spilling = set()
+
+_counters = {'hits': 0, 'misses': 0, 'reloads': 0, 'evictions': 0}
+
+
+def _read_only(df):
+    # Rebuild the frame on read-only buffers so an accidental in-place write
+    # from any session raises instead of changing the data for everyone
+    columns = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+        else:
+            # Extension arrays (Arrow strings, categoricals) are immutable
+            values = column.array
+        columns[name] = values
+    shared = pd.DataFrame(columns, index=df.index, copy=False)
+    shared.attrs = dict(df.attrs)
+    # Same data, new object: carry the version token over
+    return stamp(shared, fingerprint(df))
+
+
+def _spill_path(name):
+    # Dataset names may contain slashes and colons (parquet:/data/week41)
+    return SPILL_DIR / f"{hashlib.sha256(name.encode()).hexdigest()[:16]}.parquet"
+
+
+def _victims():
+    # Least recently used datasets over the budget, marked as being spilled;
+    # the most recent one always stays, however large. Called with the lock held.
+    total = sum(size for _, size in _datasets.values())
+    victims = []
+    for name, (df, size) in list(_datasets.items())[:-1]:
+        if total <= DATASET_CACHE_MAX_BYTES:
+            break
+        if name not in _spilling:
+            _spilling.add(name)
+            victims.append((name, df))
+        total -= size
+    return victims
+
+
+def _spill(victims):
+    # Write each victim to Parquet without holding the lock, then drop it
+    # from memory; a failed write keeps it resident. Parquet keeps the dtypes
+    # and the token is kept aside, so the reloaded frame maps to the same
+    # cached section results.
+    for name, df in victims:
+        try:
+            with _lock:
+                written = name in _spilled
+            if not written:
+                path = _spill_path(name)
+                SPILL_DIR.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(path)
+                with _lock:
+                    _spilled[name] = (path, fingerprint(df))
+        except Exception:
+            logger.warning("Could not spill dataset %r to %s; keeping it in memory",
+                           name, SPILL_DIR, exc_info=True)
+            continue
+        finally:
+            with _lock:
+                _spilling.discard(name)
+        with _lock:
+            if name in _datasets and _datasets[name][0] is df and name != next(reversed(_datasets)):
+                del _datasets[name]
+                _counters['evictions'] += 1
+
+
+def _insert(name, df):
+    # Called with the lock held; returns the shared frame and the datasets
+    # to spill once the lock is released
+    shared = _read_only(df)
+    _datasets[name] = (shared, object_bytes(shared))
+    return shared, _victims()
+
+
+def publish(name, df):
+    """Register df as the shared, read-only frame for ``name`` and return it"""
+    with _lock:
+        if name in _datasets:
+            _datasets.move_to_end(name)
+            return _datasets[name][0]
+        shared, victims = _insert(name, df)
+    _spill(victims)
+    return shared
+
+
+def get_or_create(name, factory):
+    """The shared frame for ``name``, building it with factory() only once
+
+    Frames are kept in memory up to the dataset byte budget, least recently
+    used first out; evicted frames are spilled to Parquet and reloaded from
+    there rather than rebuilt. Sessions still holding an evicted frame keep
+    it alive until they let go of it.
+    """
+    with _lock:
+        if name in _datasets:
+            _counters['hits'] += 1
+            _datasets.move_to_end(name)
+            return _datasets[name][0]
+        if name in _spilled:
+            _counters['reloads'] += 1
+            path, token = _spilled[name]
+            shared, victims = _insert(name, stamp(with_backend(pd.read_parquet(path)), token))
+        else:
+            _counters['misses'] += 1
+            shared = None
+    if shared is not None:
+        _spill(victims)
+        return shared
+    # Build outside the lock so other datasets stay available meanwhile
+    df = factory()
+    return publish(name, df)
+
+
+def datasets():
+    with _lock:
+        return {name: df for name, (df, _) in _datasets.items()}
+
+
+def cache_stats():
+    """Dataset cache counters, memory use, and in-memory hit and miss rates"""
+    with _lock:
+        lookups = _counters['hits'] + _counters['reloads'] + _counters['misses']
+        return {
+            **_counters,
+            'entries': len(_datasets),
+            'spilled': len(_spilled),
+            'bytes': sum(size for _, size in _datasets.values()),
+            'budget': DATASET_CACHE_MAX_BYTES,
+            'hit_rate': _counters['hits'] / lookups if lookups else None,
+            'miss_rate': _counters['misses'] / lookups if lookups else None,
+        }
+
+
+def object_bytes(value):
+    """Approximate memory held by one object"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(object_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(object_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def session_overhead(session_state):
+    """Bytes held by one session on top of the shared datasets"""
+    shared = {id(df) for df in datasets().values()}
+    return sum(
+        object_bytes(value)
+        for key in list(session_state.keys())
+        if id(value := session_state[key]) not in shared
+    )
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from core import categorical
+
+# Calendar buckets a cube can be rolled up to, as pandas period frequencies
+FREQUENCIES = {'Daily': 'D', 'Weekly': 'W', 'Monthly': 'M'}
+
+STATS = ('sum', 'mean', 'count', 'std')
+
+
+class DailyCube:
+    """Store x Day totals from which calendar rollups are answered
+
+    For every metric the cube keeps per-(store, day) sums, non-null counts and
+    sums of squares, so sums, means, counts and standard deviations over any
+    set of days are exact without going back to the raw rows. ``rows`` counts
+    the rows of each cell, to tell cells without data from blank metrics.
+    """
+
+    def __init__(self, stores, days, rows, sums, counts, squares):
+        self.stores = stores
+        self.days = days
+        self.rows = rows
+        self.sums = sums
+        self.counts = counts
+        self.squares = squares
+
+
+def build_cube(df, metrics=('Sales', 'Customers'), by='Store', on='Date'):
+    """Aggregate the raw rows into a DailyCube in one bincount pass per metric
+
+    Rows without a store or a date have no cell and are left out.
+    """
+    codes = categorical.factorize(df, by)
+    store_codes, stores = codes.codes, codes.uniques
+    day_values = df[on].to_numpy(dtype='datetime64[D]')
+    # A missing store has code -1, which would index the previous store's
+    # last cells, and NaT has no day at all
+    kept = (store_codes >= 0) & ~np.isnat(day_values)
+    store_codes, day_values = store_codes[kept], day_values[kept]
+    if len(day_values):
+        first_day = day_values.min()
+        day_codes = (day_values - first_day).astype(np.int64)
+        n_days = int(day_codes.max()) + 1
+    else:
+        first_day, day_codes, n_days = None, day_values.astype(np.int64), 0
+    cells = store_codes * n_days + day_codes
+    shape = (len(stores), n_days)
+    rows = np.bincount(cells, minlength=shape[0] * shape[1]).reshape(shape)
+
+    sums, counts, squares = {}, {}, {}
+    for metric in metrics:
+        values = df[metric].to_numpy(dtype=float, na_value=np.nan)[kept]
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, 0.0)
+        size = shape[0] * shape[1]
+        sums[metric] = np.bincount(cells, weights=values, minlength=size).reshape(shape)
+        counts[metric] = np.bincount(cells, weights=valid, minlength=size).reshape(shape)
+        squares[metric] = np.bincount(cells, weights=values * values, minlength=size).reshape(shape)
+
+    days = pd.date_range(pd.Timestamp(first_day), periods=n_days, freq='D') if n_days else pd.DatetimeIndex([])
+    return DailyCube(pd.Index(stores, name=by), days, rows, sums, counts, squares)
+
+
+def rollup(cube, metric, freq='Weekly', stat='sum', start=None, end=None):
+    """Periods x Stores table of ``stat`` over calendar buckets of the cube
+
+    Same as grouping the rows in the date range by the start of their period
+    and by store, ``df.groupby([df[on].dt.to_period(f).dt.start_time, by])``,
+    and unstacking the stores: a store with no rows in a period is NaN, and
+    periods or stores without any rows are left out.
+    """
+    lo = 0 if start is None else cube.days.searchsorted(pd.Timestamp(start), side='left')
+    hi = len(cube.days) if end is None else cube.days.searchsorted(pd.Timestamp(end), side='right')
+    days = cube.days[lo:hi]
+    if len(days) == 0:
+        return pd.DataFrame(columns=cube.stores)
+
+    # Days are contiguous, so each calendar bucket is a contiguous run of columns
+    periods = days.to_period(FREQUENCIES[freq])
+    boundaries = np.flatnonzero(np.concatenate(([True], periods[1:] != periods[:-1])))
+
+    def reduce(cells):
+        return np.add.reduceat(cells[:, lo:hi], boundaries, axis=1).T
+
+    present = reduce(cube.rows) > 0
+    total = reduce(cube.sums[metric])
+    count = reduce(cube.counts[metric])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if stat == 'sum':
+            values = total
+        elif stat == 'count':
+            values = count
+        elif stat == 'mean':
+            values = np.where(count > 0, total / count, np.nan)
+        elif stat == 'std':
+            variance = (reduce(cube.squares[metric]) - total * total / count) / (count - 1)
+            values = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+        else:
+            raise ValueError(f"Unknown rollup statistic {stat!r}, expected one of {STATS}")
+
+    index = pd.Index(periods[boundaries].start_time, name='Period')
+    table = pd.DataFrame(np.where(present, values, np.nan), index=index, columns=cube.stores)
+    return table.loc[present.any(axis=1), present.any(axis=0)]
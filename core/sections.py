@@ -0,0 +1,163 @@
+import hashlib
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+
+from core import cache, latency
+from core.config import SESSION_MEMO_SIZE
+from core.fingerprint import fingerprint
+
+# section id -> (compute function taking the dataset first, persist flag)
+_REGISTRY = {}
+
+_MEMO_KEY = "_section_memo"
+
+
+def _code_version():
+    # Results are only valid for the code that produced them, so any edit to
+    # the section or helper modules gives every section a fresh cache key
+    root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for path in sorted([*root.glob("core/*.py"), *root.glob("tabs/*.py")]):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+CODE_VERSION = _code_version()
+
+
+def register(section_id, persist=True):
+    """Register a tab section's computation under a stable id
+
+    Sections registered with ``persist=False`` (cheap, widget-driven ones)
+    are only memoized per session and never written to the disk cache.
+    """
+    def decorator(func):
+        _REGISTRY[section_id] = (func, persist)
+        return func
+    return decorator
+
+
+def section_ids(persisted_only=False):
+    return [
+        section_id for section_id, (_, persist) in _REGISTRY.items()
+        if persist or not persisted_only
+    ]
+
+
+def _session_memo():
+    # Bounded LRU of this session's results; None outside a Streamlit run
+    # (warm-up CLI, benchmarks)
+    if not st.runtime.exists():
+        return None
+    if _MEMO_KEY not in st.session_state:
+        st.session_state[_MEMO_KEY] = OrderedDict()
+    return st.session_state[_MEMO_KEY]
+
+
+def _disk_key(section_id, df, params):
+    operation = f"{section_id}@{CODE_VERSION}:{sorted(params.items())!r}"
+    return cache.result_key(fingerprint(df), operation)
+
+
+def _memo_key(section_id, df, params):
+    return (fingerprint(df), section_id, tuple(sorted(params.items())))
+
+
+def memoized(section_id, df, **params):
+    """This session's memoized result, or cache.MISSING"""
+    memo = _session_memo()
+    key = _memo_key(section_id, df, params)
+    if memo is None or key not in memo:
+        return cache.MISSING
+    memo.move_to_end(key)
+    return memo[key]
+
+
+def remember(section_id, df, value, **params):
+    """Memoize a result for the rest of this session"""
+    memo = _session_memo()
+    if memo is None:
+        return
+    memo[_memo_key(section_id, df, params)] = value
+    if len(memo) > SESSION_MEMO_SIZE:
+        memo.popitem(last=False)
+
+
+def session_results(df):
+    """Snapshot of this session's memoized results for df
+
+    A list of (section id, params, value), safe to read later from a thread
+    without a script run context.
+    """
+    memo = _session_memo()
+    if memo is None:
+        return []
+    version = fingerprint(df)
+    return [
+        (section_id, dict(params), value)
+        for (key_version, section_id, params), value in list(memo.items())
+        if key_version == version
+    ]
+
+
+def compute_uncached(section_id, df, **params):
+    """Run a section's computation, bypassing every cache (for benchmarks)"""
+    return _REGISTRY[section_id][0](df, **params)
+
+
+def stored(section_id, df, **params):
+    """A persisted result from the disk cache, or cache.MISSING; never computes"""
+    return cache.load(_disk_key(section_id, df, params))
+
+
+def lookup(section_id, df, **params):
+    """Like compute, returning (result, source) where source is 'disk',
+    'computed' or, for sections never persisted, 'uncached'"""
+    func, persist = _REGISTRY[section_id]
+    if not persist:
+        return func(df, **params), 'uncached'
+    key = _disk_key(section_id, df, params)
+    value = cache.load(key)
+    if value is not cache.MISSING:
+        return value, 'disk'
+    value = func(df, **params)
+    cache.store(key, value)
+    return value, 'computed'
+
+
+def compute(section_id, df, **params):
+    """Read a section's result from the disk cache, computing it on a miss
+
+    Touches neither Streamlit nor session state, so it is safe to run on a
+    background thread.
+    """
+    return lookup(section_id, df, **params)[0]
+
+
+def get(section_id, df, **params):
+    """Return a section's result for df and widget params
+
+    Reads through the session memo, then the shared disk cache, and only
+    computes on a miss in both. Callers must not modify the returned value.
+    """
+    start = time.perf_counter()
+    value, source = memoized(section_id, df, **params), 'memo'
+    if value is cache.MISSING:
+        value, source = lookup(section_id, df, **params)
+        remember(section_id, df, value, **params)
+    latency.section(section_id, source, time.perf_counter() - start)
+    return value
+
+
+def warm_up(df, only=None):
+    """Compute and persist every persisted section, or those in only, for a dataset"""
+    persisted = [
+        section_id for section_id in section_ids(persisted_only=True)
+        if only is None or section_id in only
+    ]
+    for section_id in persisted:
+        get(section_id, df)
+    return len(persisted)
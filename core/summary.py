@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from core import sections
+
+# Quantiles describe() reports, next to the extrema
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Statistics agg() can answer from the cached summary
+STATISTICS = ('count', 'sum', 'mean', 'median', 'std', 'min', 'max')
+
+
+def _column_stats(series):
+    # Everything describe() and agg() need from one column: the valid values
+    # are extracted once, one quantile call yields the extrema and quartiles
+    # together, and the moments come from the same array
+    values = series.to_numpy()
+    if values.dtype == object:
+        # Nullable and Arrow-backed columns with blanks come out as objects
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+    is_datetime = values.dtype.kind == 'M'
+    if is_datetime:
+        valid = values[~np.isnat(values)]
+        data = valid.view('i8')
+    else:
+        missing = np.isnan(values) if values.dtype.kind == 'f' else None
+        data = values if missing is None else values[~missing]
+        # Moments sum over the whole column with blanks zeroed, the same
+        # summation order as pandas, so the results match it bit for bit
+        filled = values if missing is None else np.where(missing, 0, values)
+
+    count = len(data)
+    stats = {'count': count}
+    if not count:
+        blank = pd.NaT if is_datetime else np.nan
+        stats.update(mean=blank, min=blank, max=blank, quantiles=dict.fromkeys(QUANTILES, blank))
+        return stats if is_datetime else {**stats, 'sum': 0, 'std': np.nan}
+    if is_datetime:
+        # Timestamps are interpolated as int64 ticks of their unit, as in pandas
+        points = np.quantile(data, [0, *QUANTILES, 1], method='linear')
+        unit = np.datetime_data(values.dtype)[0]
+        as_time = lambda i8: pd.Timestamp(np.int64(round(i8)), unit=unit).as_unit(unit)
+        return {
+            **stats,
+            'mean': as_time(data.mean()),
+            'min': as_time(points[0]),
+            'max': as_time(points[-1]),
+            'quantiles': {q: as_time(point) for q, point in zip(QUANTILES, points[1:-1])},
+        }
+
+    points = np.quantile(data, [0, *QUANTILES, 1], method='linear')
+    total = filled.sum()
+    mean = total / count
+    squares = (mean - filled) ** 2
+    if missing is not None:
+        squares[missing] = 0
+    std = np.sqrt(squares.sum() / (count - 1)) if count > 1 else np.nan
+    # Extrema keep the column's dtype (integers stay integers)
+    return {
+        **stats,
+        'sum': total,
+        'mean': mean,
+        'std': std,
+        'min': values.dtype.type(points[0]),
+        'max': values.dtype.type(points[-1]),
+        'quantiles': dict(zip(QUANTILES, points[1:-1])),
+    }
+
+
+def _describe(columns):
+    # Same layout as DataFrame.describe(): numeric columns list std after
+    # mean, datetime ones have none, and the row order is their union
+    described = []
+    for name, stats in columns.items():
+        rows = {'count': stats['count'], 'mean': stats['mean']}
+        if 'std' in stats:
+            rows['std'] = stats['std']
+        rows['min'] = stats['min']
+        rows.update({f"{q:.0%}": value for q, value in stats['quantiles'].items()})
+        rows['max'] = stats['max']
+        if 'std' in stats:
+            described.append(pd.Series(rows, name=name, dtype='float64'))
+        else:
+            described.append(pd.Series(rows, name=name, dtype=object))
+    order = []
+    for series in described:
+        order.extend(label for label in series.index if label not in order)
+    return pd.concat([series.reindex(order) for series in described], axis=1)
+
+
+def _summarized(dtype):
+    # Numeric and timezone-naive datetime columns, NumPy or Arrow-backed
+    if isinstance(dtype, pd.ArrowDtype):
+        dtype = dtype.numpy_dtype
+    return (pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            or pd.api.types.is_datetime64_dtype(dtype))
+
+
+@sections.register("summary.stats")
+def _summary_stats(df):
+    columns = {
+        name: _column_stats(df[name]) for name, dtype in df.dtypes.items() if _summarized(dtype)
+    }
+    return {'columns': columns, 'describe': _describe(columns)}
+
+
+def column(df, name):
+    """Cached statistics of one numeric or datetime column
+
+    A dict with count, mean, min, max and the describe() quantiles, plus
+    sum and std for numeric columns.
+    """
+    return sections.get("summary.stats", df)['columns'][name]
+
+
+def describe(df):
+    """Same as ``df.describe()``, from the cached summary"""
+    return sections.get("summary.stats", df)['describe']
+
+
+def agg(df, columns, statistics):
+    """Same as ``df[columns].agg(statistics)`` for STATISTICS names"""
+    cached = sections.get("summary.stats", df)['columns']
+    result = {}
+    for name in columns:
+        stats = cached[name]
+        result[name] = [
+            stats['quantiles'][0.5] if statistic == 'median' else stats[statistic]
+            for statistic in statistics
+        ]
+    return pd.DataFrame(result, index=list(statistics), dtype='float64')
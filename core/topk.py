@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core import categorical
+from core.fingerprint import fingerprint
+
+# Sorted permutations kept per (dataset version, columns, direction)
+PERMUTATION_CACHE_SIZE = 32
+
+# Shared by every session and the background section workers
+_permutations_lock = threading.Lock()
+_permutations = OrderedDict()
+
+
+def _as_list(value):
+    return [value] if isinstance(value, str) else list(value)
+
+
+# Flips the sign bit, mapping int64 order onto uint64 order
+_SIGN = np.uint64(1 << 63)
+
+
+def _column_key(values, asc):
+    # Order key of one column, exact for every dtype: floats stay floats,
+    # anything else becomes uint64 so large integers and nanosecond times
+    # never collapse through float. Missing entries are zeroed; the caller
+    # orders them with a separate mask
+    missing = values.isna().to_numpy()
+    dtype = values.dtype
+    if pd.api.types.is_float_dtype(dtype):
+        key = values.to_numpy(dtype=float, na_value=np.nan)
+        key = np.where(missing, 0.0, key)
+        return missing, key if asc else -key
+    if isinstance(dtype, pd.ArrowDtype) and dtype.kind in 'mM':
+        values = values.astype(dtype.numpy_dtype)
+    if values.dtype.kind in 'mM':
+        key = values.array.view('i8').view(np.uint64) ^ _SIGN
+    elif pd.api.types.is_unsigned_integer_dtype(dtype):
+        key = values.to_numpy(dtype=np.uint64, na_value=0)
+    elif pd.api.types.is_numeric_dtype(dtype):
+        key = values.to_numpy(dtype=np.int64, na_value=0).view(np.uint64) ^ _SIGN
+    else:
+        key = pd.factorize(values, sort=True)[0].view(np.uint64) ^ _SIGN
+    key = np.where(missing, np.uint64(0), key)
+    return missing, key if asc else ~key
+
+
+def _sort_keys(df, by, ascending):
+    # lexsort keys, least significant first; descending keys are flipped and
+    # missing values pushed last by a mask key ahead of their column's key,
+    # matching sort_values(..., na_position='last')
+    keys = []
+    for column, asc in zip(by, ascending):
+        missing, key = _column_key(df[column], asc)
+        if missing.any():
+            keys.append(missing)
+        keys.append(key)
+    return keys[::-1]
+
+
+def sorted_permutation(df, by, ascending=True):
+    """Row positions that stably sort df by ``by``, cached per dataset version"""
+    by = _as_list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    key = (fingerprint(df), tuple(by), tuple(ascending))
+    with _permutations_lock:
+        if key in _permutations:
+            _permutations.move_to_end(key)
+            return _permutations[key]
+    permutation = np.lexsort(_sort_keys(df, by, ascending))
+    permutation.flags.writeable = False
+    with _permutations_lock:
+        _permutations[key] = permutation
+        _permutations.move_to_end(key)
+        if len(_permutations) > PERMUTATION_CACHE_SIZE:
+            _permutations.popitem(last=False)
+    return permutation
+
+
+def _cached_permutation(df, by, ascending):
+    with _permutations_lock:
+        return _permutations.get((fingerprint(df), tuple(by), tuple(ascending)))
+
+
+def top_k(df, by, k, ascending=False):
+    """First k rows of ``df.sort_values(by, ascending, kind='stable')`` in O(n)
+
+    Candidates are narrowed with a partial selection on the leading column;
+    only rows that can reach the top k are fully sorted. A cached sorted
+    permutation of the same ordering is reused when one exists.
+    """
+    by = _as_list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    k = max(0, min(k, len(df)))
+    cached = _cached_permutation(df, by, ascending)
+    if cached is not None:
+        return df.iloc[cached[:k]]
+    if k == 0 or k == len(df):
+        return df.iloc[sorted_permutation(df, by, ascending)[:k]]
+
+    keys = _sort_keys(df, by, ascending)
+    # Narrow key by key, most significant first: rows below the k-th value
+    # are in, and rows tied with it stay candidates for the next key, so
+    # later keys and original order break ties exactly as a stable sort would
+    chosen, tied, needed = [], np.arange(len(df)), k
+    for key in reversed(keys):
+        values = key[tied]
+        threshold = np.partition(values, needed - 1)[needed - 1]
+        below = values < threshold
+        chosen.append(tied[below])
+        needed -= int(below.sum())
+        tied = tied[values == threshold]
+        if len(tied) == needed:
+            break
+    candidates = np.sort(np.concatenate([*chosen, tied]))
+    order = np.lexsort([key[candidates] for key in keys])
+    return df.iloc[candidates[order[:k]]]
+
+
+def top_k_per_group(df, group, by, k, ascending=False, dropna=True):
+    """First k rows of each group when sorted by ``by``, in group order
+
+    Same rows as ``df.sort_values(by).groupby(group, dropna=dropna).head(k)``:
+    rows with a missing group key are left out unless dropna is False, in
+    which case they form a last group of their own.
+    """
+    by = _as_list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    permutation = sorted_permutation(df, by, ascending)
+    store_codes = categorical.factorize(df, group)
+    codes, uniques = store_codes.codes, store_codes.uniques
+    if store_codes.has_missing:
+        if dropna:
+            permutation = permutation[codes[permutation] >= 0]
+        else:
+            codes = np.where(codes < 0, len(uniques), codes)
+    if len(uniques) < np.iinfo(np.int16).max:
+        # NumPy radix-sorts 16-bit integers, making the regrouping O(n)
+        codes = codes.astype(np.int16)
+    # Stable sort by group keeps the value order inside each group
+    grouped = permutation[np.argsort(codes[permutation], kind='stable')]
+    grouped_codes = codes[grouped]
+    starts = np.searchsorted(grouped_codes, grouped_codes, side='left')
+    rank = np.arange(len(grouped)) - starts
+    return df.iloc[grouped[rank < k]]
+
+
+def sorted_view(df, by, ascending=True):
+    """df sorted by ``by`` through the cached permutation"""
+    return df.iloc[sorted_permutation(df, by, ascending)]
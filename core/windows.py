@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from core import categorical
+
+DAY = np.timedelta64(1, 'D')
+
+
+def _group_bounds(codes):
+    # Start/stop positions of each run of equal codes in a sorted array
+    change = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], change))
+    stops = np.concatenate((change, [len(codes)]))
+    return starts, stops
+
+
+def _window_starts(times, starts, stops, width):
+    # First position inside the (t - width, t] window of every row, per group
+    left = np.empty(len(times), dtype=np.int64)
+    for start, stop in zip(starts, stops):
+        group_times = times[start:stop]
+        left[start:stop] = np.searchsorted(group_times, group_times - width, side='right') + start
+    return left
+
+
+def _sparse_table(values, op, max_length):
+    # table[k, i] = op over values[i:i + 2**k]; answers any range query of
+    # up to max_length rows with two lookups
+    levels = [values]
+    span = 1
+    while span * 2 <= max_length:
+        previous = levels[-1]
+        level = previous.copy()
+        level[:len(previous) - span] = op(previous[:len(previous) - span], previous[span:])
+        levels.append(level)
+        span *= 2
+    return np.stack(levels)
+
+
+def _range_query(table, op, left, right):
+    # op over values[left:right + 1] for every (left, right) pair
+    k = np.log2(right - left + 1).astype(np.int64)
+    return op(table[k, left], table[k, right - (1 << k) + 1])
+
+
+def rolling_windows(df, value, windows=(7, 28, 91), by='Store', on='Date',
+                    stats=('sum', 'mean', 'count', 'min', 'max')):
+    """Time-based rolling statistics for several windows, per group, in one pass
+
+    Equivalent to ``df.groupby(by).rolling(f'{w}D', on=on)[value].agg(stat)``
+    for every window ``w`` (in days) and stat, returned aligned to ``df.index``
+    with columns named ``{value}_{stat}_{w}d``. Rows are sorted once; sums,
+    counts and means come from prefix sums and min/max from sparse tables
+    (vectorized range-min/max lookups, standing in for a per-row deque).
+    Rows with a missing key or date are left out of every window and get NaN.
+    """
+    codes = categorical.factorize(df, by).codes
+    times = df[on].to_numpy(dtype='datetime64[ns]')
+    # Rows without a group or a date belong to no window (groupby drops
+    # missing keys) and come back as NaN
+    kept = np.flatnonzero((codes >= 0) & ~np.isnat(times))
+    order = kept[np.lexsort((times[kept], codes[kept]))]
+    times = times[order]
+    values = df[value].to_numpy(dtype=float, na_value=np.nan)[order]
+    starts, stops = _group_bounds(codes[order])
+
+    valid = ~np.isnan(values)
+    prefix_sum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    prefix_count = np.concatenate(([0], np.cumsum(valid)))
+    right = np.arange(len(values))
+
+    lefts = {w: _window_starts(times, starts, stops, w * DAY) for w in windows}
+    max_length = max(int((right - left).max()) + 1 for left in lefts.values()) if len(values) else 1
+    tables = {}
+    if 'min' in stats:
+        tables['min'] = (np.fmin, _sparse_table(np.where(valid, values, np.inf), np.fmin, max_length))
+    if 'max' in stats:
+        tables['max'] = (np.fmax, _sparse_table(np.where(valid, values, -np.inf), np.fmax, max_length))
+
+    result = {}
+    for w, left in lefts.items():
+        window_sum = prefix_sum[right + 1] - prefix_sum[left]
+        window_count = prefix_count[right + 1] - prefix_count[left]
+        empty = window_count == 0
+        computed = {
+            'sum': np.where(empty, np.nan, window_sum),
+            'count': window_count.astype(float),
+            'mean': np.where(empty, np.nan, window_sum / np.maximum(window_count, 1)),
+        }
+        for stat, (op, table) in tables.items():
+            computed[stat] = np.where(empty, np.nan, _range_query(table, op, left, right))
+        for stat in stats:
+            column = np.full(len(df), np.nan)
+            column[order] = computed[stat]
+            result[f'{value}_{stat}_{w}d'] = column
+    return pd.DataFrame(result, index=df.index)
@@ -1,5 +1,159 @@
+import argparse
+import sys
+import time
+
+
+def warm_up(args):
+    """Precompute every tab section for each available dataset into the disk cache"""
+    from core import compare, dataset, sections
+    from core.config import CACHE_DIR
+    # Importing the tab modules registers their sections
+    from tabs import tab0_download, tab1_intro, tab2_aggregating, tab3_slicing, tab4_creating_viz
+
+    for label, (name, factory) in dataset.sources().items():
+        df = factory()
+        start = time.perf_counter()
+        # The tutorial tabs only ever show the sample; other datasets are
+        # only shown through their compared aggregates
+        only = None if name == "sample" else [section_id for section_id, _, _ in compare.COMPARISONS]
+        count = sections.warm_up(df, only)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: warmed {count} sections in {elapsed:.2f}s into {CACHE_DIR}")
+
+
+def bench(args):
+    """Run one of the registered performance benchmarks"""
+    from core.benchmarks import BENCHMARKS, Bytes, Failed
+    from core.registry import format_bytes
+
+    print(f"{args.name} benchmark, {args.rows:,} rows")
+    failed = 0
+    for label, value in BENCHMARKS[args.name](args.rows):
+        if isinstance(value, Failed):
+            failed += 1
+            print(f"  {label:<40} FAILED {value}")
+        elif isinstance(value, Bytes):
+            print(f"  {label:<40} {format_bytes(value):>13}")
+        else:
+            print(f"  {label:<40} {value * 1000:>10.1f} ms")
+    if failed:
+        print(f"{failed} measurement(s) failed")
+        sys.exit(1)
+
+
+def generate(args):
+    """Write a synthetic scale-testing dataset as Parquet"""
+    from core import loadgen
+
+    spec = loadgen.LoadSpec(
+        stores=args.stores, days=args.days, start=args.start,
+        seasonality=args.seasonality, trend=args.trend,
+        missing_rate=args.missing_rate, duplicate_rate=args.duplicate_rate, seed=args.seed
+    )
+    print(f"Generating ~{spec.rows:,} rows in {spec.chunks} chunks into {args.output}")
+    start = time.perf_counter()
+    rows = loadgen.write_parquet(spec, args.output, processes=args.processes)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {rows:,} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+
+
+def check_imports(args):
+    """Fail when the app's cold import is over budget or loads plotting eagerly"""
+    from core.benchmarks import IMPORT_BUDGET_MS, LAZY_MODULES, import_times
+
+    budget_ms = IMPORT_BUDGET_MS if args.budget_ms is None else args.budget_ms
+    times = import_times()
+    total_ms = sum(times.values()) * 1000
+    eager = [name for name in times if name.split('.')[0] in LAZY_MODULES]
+    print(f"Cold import of the app modules: {total_ms:.0f} ms (budget {budget_ms} ms)")
+    if eager:
+        print(f"Imported eagerly, should be lazy: {', '.join(eager)}")
+    if eager or total_ms > budget_ms:
+        sys.exit(1)
+
+
+def load_test(args):
+    """Run concurrent sessions against a local server and fail on cross-session interference"""
+    from core.registry import format_bytes
+    from tools import loadtest
+
+    print(f"Load test: {args.sessions} concurrent sessions, {args.reruns} reruns each")
+    report = loadtest.run(sessions=args.sessions, reruns=args.reruns, timeout=args.timeout, port=args.port)
+    latency = report['latency']
+    print(f"  {report['runs']} runs in {report['seconds']:.2f}s ({report['throughput']:.2f} runs/s)")
+    print("  latency " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in latency.items()))
+    if report['peak_rss'] is not None:
+        print(f"  server peak RSS {format_bytes(report['peak_rss'])}", end="")
+        if report['rss_growth'] is not None:
+            print(f", grew {format_bytes(max(report['rss_growth'], 0))} during the test", end="")
+        print()
+    for index, errors in report['errors'].items():
+        print(f"  session {index} raised: {errors[0]}")
+    if report['interference']:
+        print(f"  output differed from a lone session in sessions {report['interference']}")
+    if report['interference'] or report['errors']:
+        sys.exit(1)
+    print("  no cross-session interference")
+
+
 def main():
-    print("Hello from data-manipulation-with-pandas!")
+    parser = argparse.ArgumentParser(
+        prog="data-manipulation-with-pandas",
+        description="Maintenance commands for the Pandas Learning Hub app"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warmup_parser = commands.add_parser(
+        "warmup",
+        help="Precompute and persist every tab's results before serving"
+    )
+    warmup_parser.set_defaults(func=warm_up)
+
+    bench_parser = commands.add_parser(
+        "bench",
+        help="Time a computation path against its plain pandas equivalent"
+    )
+    bench_parser.add_argument("name", help="Benchmark to run, e.g. 'windows'")
+    bench_parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic dataset")
+    bench_parser.set_defaults(func=bench)
+
+    generate_parser = commands.add_parser(
+        "generate",
+        help="Write a synthetic multi-store, multi-year dataset as Parquet for scale testing"
+    )
+    generate_parser.add_argument("output", help="Directory to write the Parquet parts into")
+    generate_parser.add_argument("--stores", type=int, default=1000, help="Number of stores")
+    generate_parser.add_argument("--days", type=int, default=365 * 3, help="Days of history per store")
+    generate_parser.add_argument("--start", default="2021-01-01", help="First date")
+    generate_parser.add_argument("--seasonality", type=float, default=0.2, help="Weekly and yearly cycle amplitude")
+    generate_parser.add_argument("--trend", type=float, default=0.05, help="Yearly sales growth")
+    generate_parser.add_argument("--missing-rate", type=float, default=0.0, help="Fraction of Sales/Customers left blank")
+    generate_parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Fraction of rows repeated")
+    generate_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    generate_parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all CPUs)")
+    generate_parser.set_defaults(func=generate)
+
+    imports_parser = commands.add_parser(
+        "check-imports",
+        help="Check the app's cold import time (python -X importtime) against a budget"
+    )
+    imports_parser.add_argument(
+        "--budget-ms", type=int, default=None, help="Maximum cold import time (default: 1500)"
+    )
+    imports_parser.set_defaults(func=check_imports)
+
+    loadtest_parser = commands.add_parser(
+        "loadtest",
+        help="Drive many simultaneous sessions against a local app server and check their outputs do not interfere"
+    )
+    loadtest_parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    loadtest_parser.add_argument("--reruns", type=int, default=3, help="Reruns per session after its first run")
+    loadtest_parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per run")
+    loadtest_parser.add_argument("--port", type=int, help="Port for the app server (default: any free port)")
+    loadtest_parser.set_defaults(func=load_test)
+
+    args = parser.parse_args()
+    args.func(args)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,11 @@
-import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
+import streamlit as st
+
+from core import dataset, latency, progressive, registry
+from core.config import ADMIN
 
 # Import tab modules
-from tabs import tab1_intro, tab2_aggregating, tab3_slicing, tab4_creating_viz
+from tabs import tab0_download, tab1_intro, tab2_aggregating, tab3_slicing, tab4_creating_viz, tab5_comparison
 
 st.set_page_config(
     page_title="Data Manipulation with Pandas",
@@ -60,135 +59,19 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Generate sample dataset
-@st.cache_data
-def generate_sample_data():
-    """Generate a sample dataset with 50 rows and 4 meaningful features"""
-    np.random.seed(42)
-    
-    # Generate dates for 50 consecutive days
-    start_date = datetime(2024, 1, 1)
-    dates = [start_date + timedelta(days=i) for i in range(50)]
-    
-    # Generate store data
-    stores = np.random.choice(['Store_A', 'Store_B', 'Store_C', 'Store_D', 'Store_E'], 50)
-    
-    # Generate sales data (correlated with store type)
-    store_multipliers = {'Store_A': 1.2, 'Store_B': 1.0, 'Store_C': 0.8, 'Store_D': 1.5, 'Store_E': 0.9}
-    base_sales = np.random.normal(3000, 500, 50)
-    sales = [max(1000, base_sales[i] * store_multipliers[stores[i]]) for i in range(50)]
-    
-    # Generate customer data (correlated with sales)
-    customers = [max(50, int(sale/25 + np.random.normal(0, 10))) for sale in sales]
-    
-    # Create DataFrame
-    data = {
-        'Date': dates,
-        'Store': stores,
-        'Sales': [round(s, 2) for s in sales],
-        'Customers': customers
-    }
-    
-    return pd.DataFrame(data)
-
-# Tab 0 Content Function
-def show_download_content(df):
-    """Content for the download and follow-along tab"""
-    st.markdown('<h2 class="tab-header">📥 Download & Follow Along</h2>', unsafe_allow_html=True)
-    
-    # Hero section
-    st.markdown("""
-    <div class="download-section">
-        <h3>🎯 Hey! Download the CSV and Follow Along</h3>
-        <p>Get hands-on experience by downloading our sample dataset and practicing alongside the tutorials! 
-        This interactive approach will help you master pandas operations step by step.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Download section with columns
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        st.markdown("### 🚀 What You'll Get:")
-        st.write("✅ **50 rows** of realistic retail sales data")
-        st.write("✅ **4 columns**: Date, Store, Sales, and Customers")
-        st.write("✅ **Real-world scenarios** to practice with")
-        st.write("✅ **Perfect for learning** pandas operations")
-        
-        st.markdown("### 💡 How to Use:")
-        st.write("1. Download the CSV file below")
-        st.write("2. Open it in your favorite editor (Excel, VS Code, etc.)")
-        st.write("3. Follow along with each tutorial tab")
-        st.write("4. Practice the code examples yourself!")
-    
-    with col2:
-        st.markdown("### 📁 Download Dataset")
-        
-        # Convert DataFrame to CSV for download
-        csv_data = df.to_csv(index=False)
-        
-        # Create download button
-        st.download_button(
-            label="⬇️ Download CSV Dataset",
-            data=csv_data,
-            file_name="pandas_learning_dataset.csv",
-            mime="text/csv",
-            help="Click to download the dataset used in this tutorial",
-            use_container_width=True
-        )
-        
-        st.info("💾 File size: ~2KB\n📊 Format: CSV")
-    
-    # Dataset preview
-    st.markdown("### 👀 Dataset Preview")
-    st.write("Here's a sneak peek at what you'll be working with:")
-    
-    # Show dataset info
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Rows", len(df))
-    with col2:
-        st.metric("Total Columns", len(df.columns))
-    with col3:
-        st.metric("Stores", df['Store'].nunique())
-    with col4:
-        st.metric("Date Range", "50 days")
-    
-    # Interactive preview
-    st.dataframe(
-        df.head(10), 
-        use_container_width=True,
-        hide_index=True
-    )
-    
-    # Quick stats
-    with st.expander("📈 Quick Statistics"):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Sales Statistics:**")
-            st.write(f"• Average: ${df['Sales'].mean():.2f}")
-            st.write(f"• Maximum: ${df['Sales'].max():.2f}")
-            st.write(f"• Minimum: ${df['Sales'].min():.2f}")
-        
-        with col2:
-            st.write("**Customer Statistics:**")
-            st.write(f"• Average: {df['Customers'].mean():.0f}")
-            st.write(f"• Maximum: {df['Customers'].max()}")
-            st.write(f"• Minimum: {df['Customers'].min()}")
-    
-    # Next steps
-    st.markdown("### 🎯 Ready to Start?")
-    st.success("Once you've downloaded the dataset, head over to the **🚀 Intro to Data Manipulation** tab to begin your pandas journey!")
+# Load each dataset once per process; every session references the same
+# read-only frame instead of receiving its own deserialized copy, and the
+# dataset cache bounds how many such frames stay in memory
+def load_dataset(label):
+    """The shared frame of one of dataset.sources()"""
+    name, factory = dataset.sources()[label]
+    return registry.get_or_create(name, factory)
 
 # Main app
 def main():    
     # Generate and cache the dataset
-    df = generate_sample_data()
-    
-    # Store dataset in session state for access across tabs
-    if 'df' not in st.session_state:
-        st.session_state.df = df
+    df = load_dataset("Sample")
+    latency.dataset("sample", df)
     
     # Sidebar with dataset info
     with st.sidebar:
@@ -207,30 +90,89 @@ def main():
         - Create compelling visualizations
         - Handle missing data effectively
         """)
-    
-    # Create tabs with Tab 0 added
-    tab0, tab1, tab2, tab3, tab4 = st.tabs([
+        
+        # Two versions of a dataset, e.g. this week's and last week's extract
+        st.markdown("## 🔀 Compare Versions")
+        labels = list(dataset.sources())
+        current_label = st.selectbox("Current version", labels)
+        baseline_label = st.selectbox(
+            "Baseline version", ["(none)", *(label for label in labels if label != current_label)],
+            help="Adds a tab with both versions' aggregates side by side"
+        )
+    current = load_dataset(current_label)
+    baseline = None if baseline_label == "(none)" else load_dataset(baseline_label)
+    if baseline is not None:
+        latency.dataset("current", current)
+        latency.dataset("baseline", baseline)
+    
+    # Create tabs with Tab 0 added, and the comparison tab when comparing
+    tab_names = [
         "📥 Download & Follow Along",
         "🚀 Intro to Data Manipulation",
         "📊 Aggregating DataFrames", 
         "🔍 Slicing and Indexing",
         "📈 Creating and Visualizing"
-    ])
+    ]
+    if baseline is not None:
+        tab_names.append("🔀 Comparison")
+    tab0, tab1, tab2, tab3, tab4, *tab5 = st.tabs(tab_names)
     
-    with tab0:
-        show_download_content(df)
+    # Heavy sections render placeholders first and are filled in once every
+    # tab's fast content is on screen
+    with progressive.Renderer():
+        with tab0, latency.phase("Download"):
+            tab0_download.show_content(df)
     
-    with tab1:
-        tab1_intro.show_content(df)
+        with tab1, latency.phase("Intro"):
+            tab1_intro.show_content(df)
     
-    with tab2:
-        tab2_aggregating.show_content(df)
+        with tab2, latency.phase("Aggregating"):
+            tab2_aggregating.show_content(df)
     
-    with tab3:
-        tab3_slicing.show_content(df)
+        with tab3, latency.phase("Slicing"):
+            tab3_slicing.show_content(df)
     
-    with tab4:
-        tab4_creating_viz.show_content(df)
+        with tab4, latency.phase("Visualizing"):
+            tab4_creating_viz.show_content(df)
+    
+        if baseline is not None:
+            with tab5[0], latency.phase("Comparison"):
+                tab5_comparison.show_content(current, baseline, current_label, baseline_label)
+    
+    # Memory instrumentation, rendered last so it reflects this whole rerun
+    with st.sidebar:
+        with st.expander("🔧 Instrumentation"):
+            shared_bytes = sum(registry.object_bytes(frame) for frame in registry.datasets().values())
+            st.metric("Shared datasets (all sessions)", registry.format_bytes(shared_bytes))
+            st.metric("This session's overhead", registry.format_bytes(registry.session_overhead(st.session_state)))
+            cache_stats = registry.cache_stats()
+            hit_rate = cache_stats['hit_rate']
+            st.metric(
+                "Dataset cache hit rate", "n/a" if hit_rate is None else f"{hit_rate:.0%}",
+                help=f"{cache_stats['hits']} hits, {cache_stats['reloads']} reloads from disk, "
+                     f"{cache_stats['misses']} misses, {cache_stats['evictions']} evictions; "
+                     f"{registry.format_bytes(cache_stats['bytes'])} of "
+                     f"{registry.format_bytes(cache_stats['budget'])} in memory"
+            )
+        
+        # Admin view of this process's rerun latency, across all sessions
+        if ADMIN:
+            with st.expander("⏱️ Rerun Latency"):
+                latency_stats = latency.stats()
+                hit_ratio = latency_stats['hit_ratio']
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Reruns in window", latency_stats['window'])
+                    st.metric(f"Over {latency_stats['slo_seconds']:g}s SLO", latency_stats['slow'])
+                with col2:
+                    st.metric("Section cache hit ratio", "n/a" if hit_ratio is None else f"{hit_ratio:.0%}")
+                    st.metric("Interrupted", latency_stats['interrupted'])
+                table = pd.DataFrame(latency.percentiles()).T
+                if len(table):
+                    st.dataframe((table.drop(columns='count') * 1000).round(1).add_suffix(" ms"))
+                    st.bar_chart(pd.Series(latency.histogram(), name="reruns"))
+                st.caption(f"Slow reruns are logged to logs/{latency.SLOW_LOG.name} in the cache directory")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with latency.track():
+        main()
@@ -0,0 +1,117 @@
+import streamlit as st
+
+from core import categorical, dataset, export, sections, summary
+
+
+@sections.register("tab0.csv")
+def _csv(df):
+    return dataset.to_csv(df)
+
+
+@sections.register("tab0.store_count")
+def _store_count(df):
+    return categorical.nunique(df, 'Store')
+
+
+def show_content(df):
+    """Content for the download and follow-along tab"""
+    st.markdown('<h2 class="tab-header">📥 Download & Follow Along</h2>', unsafe_allow_html=True)
+    
+    # Hero section
+    st.markdown("""
+    <div class="download-section">
+        <h3>🎯 Hey! Download the CSV and Follow Along</h3>
+        <p>Get hands-on experience by downloading our sample dataset and practicing alongside the tutorials! 
+        This interactive approach will help you master pandas operations step by step.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Download section with columns
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("### 🚀 What You'll Get:")
+        st.write("✅ **50 rows** of realistic retail sales data")
+        st.write("✅ **4 columns**: Date, Store, Sales, and Customers")
+        st.write("✅ **Real-world scenarios** to practice with")
+        st.write("✅ **Perfect for learning** pandas operations")
+        
+        st.markdown("### 💡 How to Use:")
+        st.write("1. Download the CSV file below")
+        st.write("2. Open it in your favorite editor (Excel, VS Code, etc.)")
+        st.write("3. Follow along with each tutorial tab")
+        st.write("4. Practice the code examples yourself!")
+    
+    with col2:
+        st.markdown("### 📁 Download Dataset")
+        
+        # Convert DataFrame to CSV for download
+        csv_data = sections.get("tab0.csv", df)
+        
+        # Create download button
+        st.download_button(
+            label="⬇️ Download CSV Dataset",
+            data=csv_data,
+            file_name="pandas_learning_dataset.csv",
+            mime="text/csv",
+            help="Click to download the dataset used in this tutorial",
+            use_container_width=True
+        )
+        
+        st.info("💾 File size: ~2KB\n📊 Format: CSV")
+        
+        # Every table and figure the tabs have computed, bundled from the
+        # caches only when the button is clicked
+        results = sections.session_results(df)
+        st.download_button(
+            label="📦 Download All Results",
+            data=lambda: export.bundle_bytes(df, results),
+            file_name="pandas_learning_results.zip",
+            mime="application/zip",
+            on_click="ignore",
+            help="Every section's table as Parquet, plus figures and a manifest",
+            use_container_width=True
+        )
+    
+    # Dataset preview
+    st.markdown("### 👀 Dataset Preview")
+    st.write("Here's a sneak peek at what you'll be working with:")
+    
+    # Show dataset info
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Rows", len(df))
+    with col2:
+        st.metric("Total Columns", len(df.columns))
+    with col3:
+        st.metric("Stores", sections.get("tab0.store_count", df))
+    with col4:
+        st.metric("Date Range", "50 days")
+    
+    # Interactive preview
+    st.dataframe(
+        df.head(10), 
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # Quick stats
+    with st.expander("📈 Quick Statistics"):
+        stats = {col: summary.column(df, col) for col in ['Sales', 'Customers']}
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Sales Statistics:**")
+            st.write(f"• Average: ${stats['Sales']['mean']:.2f}")
+            st.write(f"• Maximum: ${stats['Sales']['max']:.2f}")
+            st.write(f"• Minimum: ${stats['Sales']['min']:.2f}")
+        
+        with col2:
+            st.write("**Customer Statistics:**")
+            st.write(f"• Average: {stats['Customers']['mean']:.0f}")
+            st.write(f"• Maximum: {stats['Customers']['max']}")
+            st.write(f"• Minimum: {stats['Customers']['min']}")
+    
+    # Next steps
+    st.markdown("### 🎯 Ready to Start?")
+    st.success("Once you've downloaded the dataset, head over to the **🚀 Intro to Data Manipulation** tab to begin your pandas journey!")
@@ -1,6 +1,44 @@
 import streamlit as st
 import pandas as pd
 
+from core import categorical, sections, summary, topk
+
+
+@sections.register("tab1.top_sales")
+def _top_sales(df):
+    return topk.top_k(df, 'Sales', 5)
+
+
+@sections.register("tab1.top_sales_per_store")
+def _top_sales_per_store(df):
+    return topk.top_k_per_group(df, 'Store', 'Sales', 3)
+
+
+@sections.register("tab1.high_sales")
+def _high_sales(df):
+    high_sales = df[df['Sales'] > 3000]
+    return len(high_sales), high_sales.head()
+
+
+@sections.register("tab1.store_a")
+def _store_a(df):
+    store_a_data = df[categorical.equals_mask(df, 'Store_A', column='Store')]
+    return len(store_a_data), store_a_data.head()
+
+
+@sections.register("tab1.new_columns")
+def _new_columns(df):
+    # The new columns are element-wise, so deriving them for the displayed
+    # rows only gives the same table; assign() shares the base columns
+    shown = df.head()
+    df_new = shown.assign(
+        Sales_per_Customer=shown['Sales'] / shown['Customers'],
+        Month=shown['Date'].dt.month,
+        Weekday=shown['Date'].dt.day_name(),
+    )
+    return df_new[['Date', 'Store', 'Sales', 'Customers', 'Sales_per_Customer', 'Month', 'Weekday']]
+
+
 def show_content(df):
     st.markdown('<h2 class="tab-header">🚀 Intro to Data Manipulation with Pandas</h2>', unsafe_allow_html=True)
     
@@ -43,7 +81,7 @@ df.dtypes
         st.write(df.dtypes)
     with col2:
         st.write("**Basic Statistics:**")
-        st.dataframe(df.describe())
+        st.dataframe(summary.describe(df))
     
     # Parts of a DataFrame
     st.markdown("## Parts of a DataFrame")
@@ -78,9 +116,22 @@ print("Top 5 sales days:")
 df_sorted.head()
 '''
     st.code(code, language="python")
-    df_sorted = df.sort_values('Sales', ascending=False)
     st.write("**Output:**")
-    st.dataframe(df_sorted.head())
+    st.dataframe(sections.get("tab1.top_sales", df))
+    
+    # Sorting within groups
+    st.markdown("### Top Rows per Group")
+    code = '''
+# Best 3 sales days for every store
+top_per_store = (df.sort_values('Sales', ascending=False)
+                   .groupby('Store')
+                   .head(3)
+                   .sort_values('Store'))
+top_per_store
+'''
+    st.code(code, language="python")
+    st.write("**Output:**")
+    st.dataframe(sections.get("tab1.top_sales_per_store", df))
     
     # Subsetting columns
     st.markdown("### Subsetting Columns")
@@ -104,10 +155,10 @@ print(f"Days with sales > $3000: {len(high_sales)} out of {len(df)}")
 high_sales.head()
 '''
     st.code(code, language="python")
-    high_sales = df[df['Sales'] > 3000]
+    high_sales_count, high_sales_head = sections.get("tab1.high_sales", df)
     st.write("**Output:**")
-    st.write(f"Days with sales > $3000: {len(high_sales)} out of {len(df)}")
-    st.dataframe(high_sales.head())
+    st.write(f"Days with sales > $3000: {high_sales_count} out of {len(df)}")
+    st.dataframe(high_sales_head)
     
     # Subsetting rows by categorical variables
     st.markdown("### Subsetting Rows by Categorical Variables")
@@ -118,10 +169,10 @@ print(f"Store A data: {len(store_a_data)} records")
 store_a_data.head()
 '''
     st.code(code, language="python")
-    store_a_data = df[df['Store'] == 'Store_A']
+    store_a_count, store_a_head = sections.get("tab1.store_a", df)
     st.write("**Output:**")
-    st.write(f"Store A data: {len(store_a_data)} records")
-    st.dataframe(store_a_data.head())
+    st.write(f"Store A data: {store_a_count} records")
+    st.dataframe(store_a_head)
     
     # New columns
     st.markdown("## New Columns")
@@ -133,18 +184,16 @@ store_a_data.head()
     st.markdown("### Adding New Columns")
     code = '''
 # Create new columns based on existing data
-df_new = df.copy()
-df_new['Sales_per_Customer'] = df_new['Sales'] / df_new['Customers']
-df_new['Month'] = df_new['Date'].dt.month
-df_new['Weekday'] = df_new['Date'].dt.day_name()
+# assign() returns a new frame sharing df's columns; only the new ones are allocated
+df_new = df.assign(
+    Sales_per_Customer=df['Sales'] / df['Customers'],
+    Month=df['Date'].dt.month,
+    Weekday=df['Date'].dt.day_name(),
+)
 
 print("DataFrame with new columns:")
 df_new[['Date', 'Store', 'Sales', 'Customers', 'Sales_per_Customer', 'Month', 'Weekday']].head()
 '''
     st.code(code, language="python")
-    df_new = df.copy()
-    df_new['Sales_per_Customer'] = df_new['Sales'] / df_new['Customers']
-    df_new['Month'] = df_new['Date'].dt.month
-    df_new['Weekday'] = df_new['Date'].dt.day_name()
     st.write("**Output:**")
-    st.dataframe(df_new[['Date', 'Store', 'Sales', 'Customers', 'Sales_per_Customer', 'Month', 'Weekday']].head())
\ No newline at end of file
+    st.dataframe(sections.get("tab1.new_columns", df))
\ No newline at end of file
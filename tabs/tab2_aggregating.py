@@ -2,6 +2,106 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from core import categorical, dedup, progressive, sections, summary, windows
+from core.preview import show_dataframe
+
+
+@sections.register("tab2.cumulative")
+def _cumulative(df):
+    # Running totals and trailing windows of the first rows only depend on
+    # those rows, so only the displayed prefix is derived
+    shown = df[['Date', 'Sales']].head(10)
+    return shown.assign(
+        Cumulative_Sales=shown['Sales'].cumsum(),
+        Rolling_Avg_Sales=shown['Sales'].rolling(window=7).mean(),
+    )
+
+
+@sections.register("tab2.store_rolling")
+def _store_rolling(df):
+    rolling = windows.rolling_windows(df, 'Sales', windows=(7, 28, 91), stats=('mean', 'min', 'max'))
+    result = pd.concat([df[['Store', 'Date', 'Sales']], rolling.round(2)], axis=1)
+    return result.sort_values(['Store', 'Date'])
+
+
+@sections.register("tab2.store_counts")
+def _store_counts(df):
+    return categorical.value_counts(df, 'Store')
+
+
+@sections.register("tab2.duplicates")
+def _duplicates(df):
+    # Counted from row hashes; the deduplicated frame is never built
+    return {
+        'rows': dedup.duplicate_report(df),
+        'date_store': dedup.duplicate_report(df, subset=['Date', 'Store']),
+    }
+
+
+@sections.register("tab2.store_share")
+def _store_share(df):
+    store_stats = categorical.value_counts(df, 'Store')
+    store_percentage = categorical.value_counts(df, 'Store', normalize=True) * 100
+    return pd.DataFrame({
+        'Count': store_stats,
+        'Percentage': store_percentage.round(2)
+    })
+
+
+@sections.register("tab2.grouped_stats")
+def _grouped_stats(df):
+    return categorical.group_agg(df, {
+        'Sales': ['mean', 'sum', 'count'],
+        'Customers': ['mean', 'sum']
+    }, column='Store').round(2)
+
+
+@sections.register("tab2.sales_percentage")
+def _sales_percentage(df):
+    total_sales = df['Sales'].sum()
+    sales_by_store = categorical.group_sum(df, 'Sales', column='Store')
+    return (sales_by_store / total_sales * 100).round(2)
+
+
+@sections.register("tab2.monthly_stats")
+def _monthly_stats(df):
+    df_with_month = df.assign(Month=df['Date'].dt.month)
+    return df_with_month.groupby(['Store', 'Month']).agg({
+        'Sales': 'mean',
+        'Customers': 'mean'
+    }).round(2)
+
+
+@sections.register("tab2.multi_agg")
+def _multi_agg(df):
+    return categorical.group_agg(df, {
+        'Sales': ['count', 'mean', 'std', 'min', 'max'],
+        'Customers': ['mean', 'std']
+    }, column='Store').round(2)
+
+
+def _pivot_data(df):
+    # A view of df plus Month; only the new column is allocated
+    return df.assign(Month=df['Date'].dt.month)
+
+
+@sections.register("tab2.pivot_simple")
+def _pivot_simple(df):
+    # A pivot on Store alone is a grouped mean, answered from the store codes
+    return categorical.group_agg(df, {'Sales': 'mean'}, column='Store').round(2)
+
+
+@sections.register("tab2.pivot_complex")
+def _pivot_complex(df):
+    return _pivot_data(df).pivot_table(
+        values=['Sales', 'Customers'],
+        index='Store',
+        columns='Month',
+        aggfunc='mean',
+        fill_value=0
+    ).round(2)
+
+
 def show_content(df):
     st.markdown('<h2 class="tab-header">📊 Aggregating DataFrames</h2>', unsafe_allow_html=True)
     
@@ -18,7 +118,7 @@ df.describe()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    st.dataframe(df.describe())
+    st.dataframe(summary.describe(df))
     
     # Mean and median
     st.markdown("### Mean and Median")
@@ -31,14 +131,15 @@ print(f"Mean Customers: {df['Customers'].mean():.0f}")
 print(f"Median Customers: {df['Customers'].median():.0f}")
 '''
     st.code(code, language="python")
+    sales, customers = summary.column(df, 'Sales'), summary.column(df, 'Customers')
     st.write("**Output:**")
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Mean Sales", f"${df['Sales'].mean():.2f}")
-        st.metric("Mean Customers", f"{df['Customers'].mean():.0f}")
+        st.metric("Mean Sales", f"${sales['mean']:.2f}")
+        st.metric("Mean Customers", f"{customers['mean']:.0f}")
     with col2:
-        st.metric("Median Sales", f"${df['Sales'].median():.2f}")
-        st.metric("Median Customers", f"{df['Customers'].median():.0f}")
+        st.metric("Median Sales", f"${sales['quantiles'][0.5]:.2f}")
+        st.metric("Median Customers", f"{customers['quantiles'][0.5]:.0f}")
     
     # Summarizing dates
     st.markdown("### Summarizing Dates")
@@ -50,10 +151,12 @@ print(f"End Date: {df['Date'].max()}")
 print(f"Total Days: {(df['Date'].max() - df['Date'].min()).days + 1}")
 '''
     st.code(code, language="python")
+    dates = summary.column(df, 'Date')
+    start_date, end_date = dates['min'], dates['max']
     st.write("**Output:**")
-    st.write(f"**Start Date:** {df['Date'].min().strftime('%Y-%m-%d')}")
-    st.write(f"**End Date:** {df['Date'].max().strftime('%Y-%m-%d')}")
-    st.write(f"**Total Days:** {(df['Date'].max() - df['Date'].min()).days + 1}")
+    st.write(f"**Start Date:** {start_date.strftime('%Y-%m-%d')}")
+    st.write(f"**End Date:** {end_date.strftime('%Y-%m-%d')}")
+    st.write(f"**Total Days:** {(end_date - start_date).days + 1}")
     
     # Efficient summaries
     st.markdown("## Efficient Summaries")
@@ -63,25 +166,41 @@ summary = df[['Sales', 'Customers']].agg(['mean', 'median', 'std', 'min', 'max']
 summary
 '''
     st.code(code, language="python")
-    summary = df[['Sales', 'Customers']].agg(['mean', 'median', 'std', 'min', 'max'])
     st.write("**Output:**")
-    st.dataframe(summary)
+    st.dataframe(summary.agg(df, ['Sales', 'Customers'], ['mean', 'median', 'std', 'min', 'max']))
     
     # Cumulative statistics
     st.markdown("### Cumulative Statistics")
     code = '''
 # Calculate cumulative sum and rolling average
-df_cum = df.copy()
-df_cum['Cumulative_Sales'] = df_cum['Sales'].cumsum()
-df_cum['Rolling_Avg_Sales'] = df_cum['Sales'].rolling(window=7).mean()
+df_cum = df.assign(
+    Cumulative_Sales=df['Sales'].cumsum(),
+    Rolling_Avg_Sales=df['Sales'].rolling(window=7).mean(),
+)
 df_cum[['Date', 'Sales', 'Cumulative_Sales', 'Rolling_Avg_Sales']].head(10)
 '''
     st.code(code, language="python")
-    df_cum = df.copy()
-    df_cum['Cumulative_Sales'] = df_cum['Sales'].cumsum()
-    df_cum['Rolling_Avg_Sales'] = df_cum['Sales'].rolling(window=7).mean()
     st.write("**Output:**")
-    st.dataframe(df_cum[['Date', 'Sales', 'Cumulative_Sales', 'Rolling_Avg_Sales']].head(10))
+    st.dataframe(sections.get("tab2.cumulative", df))
+    
+    # Rolling windows per group
+    st.markdown("### Rolling Windows per Store")
+    code = '''
+# Time-based rolling windows computed separately for each store
+df_sorted = df.sort_values(['Store', 'Date'])
+rolling_sales = df_sorted.groupby('Store').rolling('7D', on='Date')['Sales']
+df_sorted['Sales_mean_7d'] = rolling_sales.mean().values
+df_sorted['Sales_min_7d'] = rolling_sales.min().values
+df_sorted['Sales_max_7d'] = rolling_sales.max().values
+# ...and the same again for '28D' and '91D'
+df_sorted.head(10)
+'''
+    st.code(code, language="python")
+    st.write("**Output:**")
+    progressive.defer(
+        "tab2.store_rolling", df,
+        lambda rolling: show_dataframe(rolling, "tab2.store_rolling", page_size=10)
+    )
     
     # Counting
     st.markdown("## Counting")
@@ -92,9 +211,9 @@ store_counts = df['Store'].value_counts()
 print(store_counts)
 '''
     st.code(code, language="python")
-    store_counts = df['Store'].value_counts()
+    store_counts = sections.get("tab2.store_counts", df)
     st.write("**Output:**")
-    st.dataframe(store_counts)
+    show_dataframe(store_counts, "tab2.store_counts")
     
     # Dropping duplicates
     st.markdown("### Dropping Duplicates")
@@ -104,13 +223,20 @@ print(f"Original DataFrame shape: {df.shape}")
 df_no_duplicates = df.drop_duplicates()
 print(f"After removing duplicates: {df_no_duplicates.shape}")
 print(f"Duplicates found: {len(df) - len(df_no_duplicates)}")
+
+# Rows repeating the same Date and Store, whatever their other values
+print(f"Duplicate (Date, Store) keys: {df.duplicated(subset=['Date', 'Store']).sum()}")
 '''
     st.code(code, language="python")
-    df_no_duplicates = df.drop_duplicates()
+    duplicates = sections.get("tab2.duplicates", df)
     st.write("**Output:**")
     st.write(f"**Original DataFrame shape:** {df.shape}")
-    st.write(f"**After removing duplicates:** {df_no_duplicates.shape}")
-    st.write(f"**Duplicates found:** {len(df) - len(df_no_duplicates)}")
+    st.write(f"**After removing duplicates:** {(duplicates['rows']['unique'], df.shape[1])}")
+    st.write(f"**Duplicates found:** {duplicates['rows']['duplicates']}")
+    st.write(f"**Duplicate (Date, Store) keys:** {duplicates['date_store']['duplicates']}")
+    if duplicates['rows']['duplicates']:
+        st.write("Sample duplicate rows:")
+        st.dataframe(duplicates['rows']['samples'])
     
     # Counting categorical variables
     st.markdown("### Counting Categorical Variables")
@@ -126,14 +252,9 @@ result = pd.DataFrame({
 result
 '''
     st.code(code, language="python")
-    store_stats = df['Store'].value_counts()
-    store_percentage = df['Store'].value_counts(normalize=True) * 100
-    result = pd.DataFrame({
-        'Count': store_stats,
-        'Percentage': store_percentage.round(2)
-    })
+    result = sections.get("tab2.store_share", df)
     st.write("**Output:**")
-    st.dataframe(result)
+    show_dataframe(result, "tab2.store_share")
     
     # Grouped summary statistics
     st.markdown("## Grouped Summary Statistics")
@@ -146,12 +267,9 @@ grouped_stats = df.groupby('Store').agg({
 grouped_stats
 '''
     st.code(code, language="python")
-    grouped_stats = df.groupby('Store').agg({
-        'Sales': ['mean', 'sum', 'count'],
-        'Customers': ['mean', 'sum']
-    }).round(2)
+    grouped_stats = sections.get("tab2.grouped_stats", df)
     st.write("**Output:**")
-    st.dataframe(grouped_stats)
+    show_dataframe(grouped_stats, "tab2.grouped_stats")
     
     # What percent of sales occurred at each store type?
     st.markdown("### What percent of sales occurred at each store type?")
@@ -166,9 +284,7 @@ for store, pct in sales_percentage.items():
     print(f"{store}: {pct}%")
 '''
     st.code(code, language="python")
-    total_sales = df['Sales'].sum()
-    sales_by_store = df.groupby('Store')['Sales'].sum()
-    sales_percentage = (sales_by_store / total_sales * 100).round(2)
+    sales_percentage = sections.get("tab2.sales_percentage", df)
     st.write("**Output:**")
     for store, pct in sales_percentage.items():
         st.write(f"**{store}:** {pct}%")
@@ -177,8 +293,7 @@ for store, pct in sales_percentage.items():
     st.markdown("### Calculations with .groupby()")
     code = '''
 # Advanced groupby calculations
-df_with_month = df.copy()
-df_with_month['Month'] = df_with_month['Date'].dt.month
+df_with_month = df.assign(Month=df['Date'].dt.month)
 
 monthly_stats = df_with_month.groupby(['Store', 'Month']).agg({
     'Sales': 'mean',
@@ -187,14 +302,9 @@ monthly_stats = df_with_month.groupby(['Store', 'Month']).agg({
 monthly_stats.head(10)
 '''
     st.code(code, language="python")
-    df_with_month = df.copy()
-    df_with_month['Month'] = df_with_month['Date'].dt.month
-    monthly_stats = df_with_month.groupby(['Store', 'Month']).agg({
-        'Sales': 'mean',
-        'Customers': 'mean'
-    }).round(2)
+    monthly_stats = sections.get("tab2.monthly_stats", df)
     st.write("**Output:**")
-    st.dataframe(monthly_stats.head(10))
+    show_dataframe(monthly_stats, "tab2.monthly_stats", page_size=10)
     
     # Multiple grouped summaries
     st.markdown("### Multiple Grouped Summaries")
@@ -207,21 +317,16 @@ multi_agg = df.groupby('Store').agg({
 multi_agg
 '''
     st.code(code, language="python")
-    multi_agg = df.groupby('Store').agg({
-        'Sales': ['count', 'mean', 'std', 'min', 'max'],
-        'Customers': ['mean', 'std']
-    }).round(2)
+    multi_agg = sections.get("tab2.multi_agg", df)
     st.write("**Output:**")
-    st.dataframe(multi_agg)
+    show_dataframe(multi_agg, "tab2.multi_agg")
     
     # Pivot tables
     st.markdown("## Pivot Tables")
     st.markdown("### Pivoting on one variable")
     code = '''
 # Create a simple pivot table
-df_pivot_data = df.copy()
-df_pivot_data['Month'] = df_pivot_data['Date'].dt.month
-df_pivot_data['Week'] = df_pivot_data['Date'].dt.isocalendar().week
+df_pivot_data = df.assign(Month=df['Date'].dt.month)
 
 pivot_simple = df_pivot_data.pivot_table(
     values='Sales',
@@ -231,16 +336,9 @@ pivot_simple = df_pivot_data.pivot_table(
 pivot_simple
 '''
     st.code(code, language="python")
-    df_pivot_data = df.copy()
-    df_pivot_data['Month'] = df_pivot_data['Date'].dt.month
-    df_pivot_data['Week'] = df_pivot_data['Date'].dt.isocalendar().week
-    pivot_simple = df_pivot_data.pivot_table(
-        values='Sales',
-        index='Store',
-        aggfunc='mean'
-    ).round(2)
+    pivot_simple = sections.get("tab2.pivot_simple", df)
     st.write("**Output:**")
-    st.dataframe(pivot_simple)
+    show_dataframe(pivot_simple, "tab2.pivot_simple")
     
     # Fill in missing values and sum values with pivot tables
     st.markdown("### Fill in missing values and sum values with pivot tables")
@@ -256,12 +354,8 @@ pivot_complex = df_pivot_data.pivot_table(
 pivot_complex
 '''
     st.code(code, language="python")
-    pivot_complex = df_pivot_data.pivot_table(
-        values=['Sales', 'Customers'],
-        index='Store',
-        columns='Month',
-        aggfunc='mean',
-        fill_value=0
-    ).round(2)
     st.write("**Output:**")
-    st.dataframe(pivot_complex)
\ No newline at end of file
+    progressive.defer(
+        "tab2.pivot_complex", df,
+        lambda pivot_complex: show_dataframe(pivot_complex, "tab2.pivot_complex")
+    )
\ No newline at end of file
@@ -2,6 +2,104 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from core import categorical, query, rollup, sections
+from core.preview import show_dataframe
+
+
+@sections.register("tab3.date_index")
+def _date_index(df):
+    df_date_index = df.set_index('Date')
+    first_date = df_date_index.index[0]
+    return {
+        'head': df_date_index.head(),
+        'reset_head': df_date_index.reset_index().head(),
+        'first_date': first_date,
+        'first_row': df_date_index.loc[first_date],
+    }
+
+
+@sections.register("tab3.multi_index")
+def _multi_index(df):
+    df_multi = df.set_index(['Store', 'Date'])
+    return df_multi.head(), df_multi.sort_index().head()
+
+
+@sections.register("tab3.date_slice")
+def _date_slice(df):
+    df_date_index = df.set_index('Date')
+    start_date = df_date_index.index[5]
+    end_date = df_date_index.index[15]
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'head': df_date_index.loc[start_date:end_date].head(),
+        'subset_head': df_date_index.loc[start_date:end_date, ['Store', 'Sales']].head(),
+    }
+
+
+@sections.register("tab3.january")
+def _january(df):
+    # Partial date strings need a DatetimeIndex, which Arrow-backed
+    # timestamps only give when converted explicitly
+    df_date_index = df.set_index('Date')
+    df_date_index.index = pd.DatetimeIndex(df_date_index.index)
+    january_data = df_date_index.loc['2024-01']
+    return len(january_data), january_data.head()
+
+
+@sections.register("tab3.daily_cube")
+def _daily_cube(df):
+    return rollup.build_cube(df, metrics=('Sales', 'Customers'))
+
+
+@sections.register("tab3.rollup", persist=False)
+def _rollup(df, metric, freq, stat, start, end):
+    cube = sections.get("tab3.daily_cube", df)
+    return rollup.rollup(cube, metric, freq=freq, stat=stat, start=start, end=end).round(2)
+
+
+@sections.register("tab3.query_builder", persist=False)
+def _query_builder(df, query_text, group_column):
+    row_mask = query.mask(query.plan_for(query_text, df), df)
+    query_result = df[row_mask]
+    if group_column == "(none)":
+        return query_result
+    numeric_columns = [c for c in query_result.select_dtypes('number').columns if c != group_column]
+    return query_result.groupby(group_column)[numeric_columns].agg(['count', 'mean', 'sum']).round(2)
+
+
+@sections.register("tab3.pivot_sales")
+def _pivot_sales(df):
+    # A view of df plus Month; only the new column is allocated
+    df_analysis = df.assign(Month=df['Date'].dt.month)
+    return df_analysis.pivot_table(
+        values='Sales',
+        index='Store',
+        columns='Month',
+        aggfunc='mean',
+        fill_value=0
+    ).round(2)
+
+
+@sections.register("tab3.pivot_with_totals")
+def _pivot_with_totals(df):
+    pivot_with_totals = sections.get("tab3.pivot_sales", df).copy()
+    pivot_with_totals['Total'] = pivot_with_totals.sum(axis=1)
+    pivot_with_totals.loc['Average'] = pivot_with_totals.mean()
+    return pivot_with_totals.round(2)
+
+
+@sections.register("tab3.high_sales_store_a")
+def _high_sales_store_a(df):
+    return df[(df['Sales'] > 3000).to_numpy() & categorical.equals_mask(df, 'Store_A', column='Store')]
+
+
+@sections.register("tab3.query")
+def _query(df):
+    query_result = df.query('Sales > 3000 and Customers > 100')
+    return len(query_result), query_result.head()
+
+
 def show_content(df):
     st.markdown('<h2 class="tab-header">🔍 Slicing and Indexing DataFrames</h2>', unsafe_allow_html=True)
     
@@ -20,9 +118,9 @@ print("DataFrame with Date as index:")
 df_date_index.head()
 '''
     st.code(code, language="python")
-    df_date_index = df.set_index('Date')
+    date_index = sections.get("tab3.date_index", df)
     st.write("**Output:**")
-    st.dataframe(df_date_index.head())
+    st.dataframe(date_index['head'])
     
     code = '''
 # Reset index back to default
@@ -31,9 +129,8 @@ print("DataFrame with reset index:")
 df_reset.head()
 '''
     st.code(code, language="python")
-    df_reset = df_date_index.reset_index()
     st.write("**Output:**")
-    st.dataframe(df_reset.head())
+    st.dataframe(date_index['reset_head'])
     
     # Subsetting with .loc[]
     st.markdown("### Subsetting with .loc[]")
@@ -45,10 +142,10 @@ print(f"Date: {first_date}")
 print(df_date_index.loc[first_date])
 '''
     st.code(code, language="python")
-    first_date = df_date_index.index[0]
+    first_date = date_index['first_date']
     st.write("**Output:**")
     st.write(f"**Date:** {first_date}")
-    result = df_date_index.loc[first_date]
+    result = date_index['first_row']
     for idx, val in result.items():
         st.write(f"**{idx}:** {val}")
     
@@ -61,9 +158,9 @@ print("DataFrame with multi-level index:")
 df_multi.head()
 '''
     st.code(code, language="python")
-    df_multi = df.set_index(['Store', 'Date'])
+    multi_head, sorted_index_head = sections.get("tab3.multi_index", df)
     st.write("**Output:**")
-    st.dataframe(df_multi.head())
+    st.dataframe(multi_head)
     
     # Sorting by index values
     st.markdown("### Sorting by index values")
@@ -74,9 +171,8 @@ print("DataFrame sorted by multi-level index:")
 df_sorted_index.head()
 '''
     st.code(code, language="python")
-    df_sorted_index = df_multi.sort_index()
     st.write("**Output:**")
-    st.dataframe(df_sorted_index.head())
+    st.dataframe(sorted_index_head)
     
     # Slicing and subsetting with .loc and .iloc
     st.markdown("## Slicing and subsetting with .loc and .iloc")
@@ -92,12 +188,11 @@ print(f"Data from {start_date} to {end_date}:")
 date_slice.head()
 '''
     st.code(code, language="python")
-    start_date = df_date_index.index[5]
-    end_date = df_date_index.index[15]
-    date_slice = df_date_index.loc[start_date:end_date]
+    date_slice = sections.get("tab3.date_slice", df)
+    start_date, end_date = date_slice['start_date'], date_slice['end_date']
     st.write("**Output:**")
     st.write(f"Data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}:")
-    st.dataframe(date_slice.head())
+    st.dataframe(date_slice['head'])
     
     # Slicing in both directions
     st.markdown("### Slicing in both directions")
@@ -108,9 +203,8 @@ print("Subset with specific date range and columns:")
 subset.head()
 '''
     st.code(code, language="python")
-    subset = df_date_index.loc[start_date:end_date, ['Store', 'Sales']]
     st.write("**Output:**")
-    st.dataframe(subset.head())
+    st.dataframe(date_slice['subset_head'])
     
     # Slicing time series
     st.markdown("### Slicing time series")
@@ -123,11 +217,46 @@ print(f"January 2024 data ({len(january_data)} records):")
 january_data.head()
 '''
     st.code(code, language="python")
-    df_time = df.set_index('Date')
-    january_data = df_time.loc['2024-01']
+    january_count, january_head = sections.get("tab3.january", df)
     st.write("**Output:**")
-    st.write(f"January 2024 data ({len(january_data)} records):")
-    st.dataframe(january_data.head())
+    st.write(f"January 2024 data ({january_count} records):")
+    st.dataframe(january_head)
+    
+    # Calendar rollups
+    st.markdown("### Calendar rollups")
+    # Rollups are answered from a Store x Day cube built once per dataset,
+    # so changing these widgets never rescans the raw rows
+    cube = sections.get("tab3.daily_cube", df)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        freq = st.selectbox("Period", list(rollup.FREQUENCIES), index=1, key="rollup_freq")
+    with col2:
+        metric = st.selectbox("Metric", list(cube.sums), key="rollup_metric")
+    with col3:
+        stat = st.selectbox("Statistic", rollup.STATS, key="rollup_stat")
+    with col4:
+        first_day, last_day = cube.days[0].date(), cube.days[-1].date()
+        date_range = st.date_input(
+            "Date range",
+            value=(first_day, last_day),
+            min_value=first_day,
+            max_value=last_day,
+            key="rollup_dates"
+        )
+    start, end = (date_range[0], date_range[-1]) if date_range else (first_day, last_day)
+    code = f'''
+# Group the rows in the date range by calendar period and store
+in_range = df[df['Date'].between('{start}', '{end}')]
+period = in_range['Date'].dt.to_period('{rollup.FREQUENCIES[freq]}').dt.start_time.rename('Period')
+rollup = in_range.groupby([period, 'Store'])['{metric}'].agg('{stat}').unstack('Store')
+rollup.round(2)
+'''
+    st.code(code, language="python")
+    st.write("**Output:**")
+    show_dataframe(
+        sections.get("tab3.rollup", df, metric=metric, freq=freq, stat=stat, start=start, end=end),
+        "tab3.rollup"
+    )
     
     # Subsetting by row/column number
     st.markdown("### Subsetting by row/column number")
@@ -151,7 +280,7 @@ specific_subset
     st.code(code, language="python")
     specific_subset = df.iloc[10:15, 1:4]
     st.write("**Output:**")
-    st.dataframe(specific_subset)
+    show_dataframe(specific_subset, "tab3.specific_subset")
     
     # Working with pivot tables
     st.markdown("## Working with pivot tables")
@@ -160,9 +289,7 @@ specific_subset
     st.markdown("### Pivot sales by store and month")
     code = '''
 # Create pivot table for analysis
-df_analysis = df.copy()
-df_analysis['Month'] = df_analysis['Date'].dt.month
-df_analysis['Week'] = df_analysis['Date'].dt.isocalendar().week
+df_analysis = df.assign(Month=df['Date'].dt.month)
 
 pivot_sales = df_analysis.pivot_table(
     values='Sales',
@@ -175,18 +302,9 @@ print("Sales by Store and Month:")
 pivot_sales
 '''
     st.code(code, language="python")
-    df_analysis = df.copy()
-    df_analysis['Month'] = df_analysis['Date'].dt.month
-    df_analysis['Week'] = df_analysis['Date'].dt.isocalendar().week
-    pivot_sales = df_analysis.pivot_table(
-        values='Sales',
-        index='Store',
-        columns='Month',
-        aggfunc='mean',
-        fill_value=0
-    ).round(2)
+    pivot_sales = sections.get("tab3.pivot_sales", df)
     st.write("**Output:**")
-    st.dataframe(pivot_sales)
+    show_dataframe(pivot_sales, "tab3.pivot_sales")
     
     # Subsetting pivot tables
     st.markdown("### Subsetting pivot tables")
@@ -201,7 +319,7 @@ pivot_subset
     selected_stores = ['Store_A', 'Store_B']
     pivot_subset = pivot_sales.loc[selected_stores]
     st.write("**Output:**")
-    st.dataframe(pivot_subset)
+    show_dataframe(pivot_subset, "tab3.pivot_subset")
     
     # Calculating on a pivot table
     st.markdown("### Calculating on a pivot table")
@@ -215,11 +333,8 @@ print("Pivot table with totals and averages:")
 pivot_with_totals.round(2)
 '''
     st.code(code, language="python")
-    pivot_with_totals = pivot_sales.copy()
-    pivot_with_totals['Total'] = pivot_with_totals.sum(axis=1)
-    pivot_with_totals.loc['Average'] = pivot_with_totals.mean()
     st.write("**Output:**")
-    st.dataframe(pivot_with_totals.round(2))
+    show_dataframe(sections.get("tab3.pivot_with_totals", df), "tab3.pivot_with_totals")
     
     # Advanced indexing examples
     st.markdown("## Advanced Indexing Examples")
@@ -230,10 +345,10 @@ print(f"Store A with high sales: {len(high_sales_store_a)} records")
 high_sales_store_a
 '''
     st.code(code, language="python")
-    high_sales_store_a = df[(df['Sales'] > 3000) & (df['Store'] == 'Store_A')]
+    high_sales_store_a = sections.get("tab3.high_sales_store_a", df)
     st.write("**Output:**")
     st.write(f"Store A with high sales: {len(high_sales_store_a)} records")
-    st.dataframe(high_sales_store_a)
+    show_dataframe(high_sales_store_a, "tab3.high_sales_store_a")
     
     code = '''
 # Query method for complex filtering
@@ -242,7 +357,37 @@ print(f"Query result: {len(query_result)} records")
 query_result.head()
 '''
     st.code(code, language="python")
-    query_result = df.query('Sales > 3000 and Customers > 100')
+    query_count, query_head = sections.get("tab3.query", df)
     st.write("**Output:**")
-    st.write(f"Query result: {len(query_result)} records")
-    st.dataframe(query_result.head())
\ No newline at end of file
+    st.write(f"Query result: {query_count} records")
+    st.dataframe(query_head)
+    
+    # Interactive query builder
+    st.markdown("### Build your own query")
+    st.markdown("""
+    Write a filter using column names, comparisons and `and` / `or` / `not`, for example
+    `Store in ['Store_A', 'Store_B'] and Sales > 2500`. Optionally group the matching rows.
+    """)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query_text = st.text_input("Filter", value="Sales > 3000 and Customers > 100", key="query_text")
+    with col2:
+        group_column = st.selectbox("Group by", ["(none)", *df.columns], key="query_group")
+    try:
+        query_output = sections.get("tab3.query_builder", df, query_text=query_text, group_column=group_column)
+    except query.QueryError as exc:
+        st.error(str(exc))
+    else:
+        code = f'''
+query_result = df.query({query_text!r})
+'''
+        if group_column != "(none)":
+            code += f"query_result.groupby({group_column!r}).agg(['count', 'mean', 'sum'])\n"
+        st.code(code, language="python")
+        st.write("**Output:**")
+        if group_column == "(none)":
+            st.write(f"Query result: {len(query_output)} records")
+            show_dataframe(query_output, "tab3.query_builder")
+        else:
+            st.write(f"Query result: {len(query_output)} groups")
+            show_dataframe(query_output, "tab3.query_builder_grouped")
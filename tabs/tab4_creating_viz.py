@@ -1,10 +1,188 @@
+import io
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 
+from core import categorical, dataset, missing, progressive, sections, topk
+from core.preview import show_dataframe
+
+
+def _figure(**kwargs):
+    # matplotlib is imported on first use so that a cold start, or a warm
+    # cache that already holds every figure, never pays for loading it
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
+def _to_png(fig):
+    # Figures are rendered once and cached as PNG bytes; building them on a
+    # plain Figure (not pyplot) keeps concurrent sessions from sharing state
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+@sections.register("tab4.store_counts_plot")
+def _store_counts_plot(df):
+    fig = _figure(figsize=(10, 6))
+    ax = fig.subplots()
+    store_counts = categorical.value_counts(df, 'Store')
+    ax.bar(store_counts.index, store_counts.values, color='skyblue')
+    ax.set_title('Number of Sales Records by Store')
+    ax.set_xlabel('Store')
+    ax.set_ylabel('Number of Records')
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+@sections.register("tab4.sales_over_time_plot")
+def _sales_over_time_plot(df):
+    fig = _figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.plot(df['Date'], df['Sales'], marker='o', linewidth=2, markersize=4, color='green')
+    ax.set_title('Sales Over Time')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Sales ($)')
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+# seaborn's default box styling: C0 at 75% saturation, lines in a gray at
+# 60% of its lightness
+BOX_FACE = (0.1946, 0.4534, 0.6328)
+BOX_LINE = '0.2482'
+
+
+def _draw_boxes(ax, stats, width=0.8):
+    # What sns.boxplot(x=..., y=...) draws, from precomputed statistics
+    positions = np.arange(len(stats))
+    ax.bxp(
+        stats, positions=positions, widths=width, capwidths=width / 2,
+        patch_artist=True, manage_ticks=False,
+        boxprops={'facecolor': BOX_FACE, 'edgecolor': BOX_LINE},
+        medianprops={'color': BOX_LINE, 'solid_capstyle': 'butt'},
+        whiskerprops={'color': BOX_LINE, 'solid_capstyle': 'butt'},
+        capprops={'color': BOX_LINE},
+        flierprops={'markeredgecolor': BOX_LINE},
+    )
+    ax.set_xticks(positions, [box['label'] for box in stats])
+    ax.set_xlim(-0.5, len(stats) - 0.5)
+
+
+@sections.register("tab4.boxplot")
+def _boxplot(df):
+    fig = _figure(figsize=(12, 6))
+    ax = fig.subplots()
+    _draw_boxes(ax, categorical.box_stats(df, 'Sales', column='Store'))
+    ax.set_title('Sales Distribution by Store')
+    ax.set_xlabel('Store')
+    ax.set_ylabel('Sales ($)')
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+@sections.register("tab4.scatter_plot")
+def _scatter_plot(df):
+    fig = _figure(figsize=(10, 6))
+    ax = fig.subplots()
+    colors = {'Store_A': 'red', 'Store_B': 'blue', 'Store_C': 'green', 
+              'Store_D': 'orange', 'Store_E': 'purple'}
+    # Stores in order of appearance, selected by integer code compares
+    store_codes = categorical.factorize(df, 'Store')
+    customers = df['Customers'].to_numpy()
+    sales = df['Sales'].to_numpy()
+    for code in store_codes.first_seen:
+        store = store_codes.uniques[code]
+        in_store = store_codes.codes == code
+        ax.scatter(customers[in_store], sales[in_store], 
+                  label=store, alpha=0.7, color=colors[store])
+    
+    ax.set_title('Sales vs Customers by Store')
+    ax.set_xlabel('Number of Customers')
+    ax.set_ylabel('Sales ($)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return _to_png(fig)
+
+
+@sections.register("tab4.missing_values")
+def _missing_values(df):
+    return missing.missing_summary(df)
+
+
+@sections.register("tab4.missing_demo")
+def _missing_demo(df):
+    # One working copy: NaNs are injected into it, summarized from a single
+    # null mask, then filled in place
+    working = missing.inject_missing(df, ['Sales', 'Customers'], rate=0.1, seed=42)
+    summary = missing.missing_summary(working)
+    filled_counts = missing.fill_missing(
+        working, {'Sales': 'mean', 'Customers': 'median'}, summary=summary
+    )
+    return {
+        'missing_counts': summary['counts'],
+        'shape': working.shape,
+        'no_missing_shape': summary['dropna_shape'],
+        'filled_counts': filled_counts,
+        'filled_head': working.head(),
+    }
+
+
+@sections.register("tab4.csv_lines")
+def _csv_lines(df):
+    csv_string = dataset.to_csv(df)
+    return csv_string.split('\n')[:6]
+
+
+@sections.register("tab4.advanced_result")
+def _advanced_result(df):
+    result = categorical.group_agg(
+        df, {'Sales': ['mean', 'sum'], 'Customers': 'mean'}, column='Store'
+    ).round(2)
+    result.columns = ['Avg_Sales', 'Total_Sales', 'Avg_Customers']
+    return topk.sorted_view(result, 'Total_Sales', ascending=False)
+
+
+@sections.register("tab4.dashboard")
+def _dashboard(df):
+    fig = _figure(figsize=(15, 10))
+    axes = fig.subplots(2, 2)
+    
+    # Sales distribution
+    axes[0,0].hist(df['Sales'], bins=15, alpha=0.7, color='skyblue')
+    axes[0,0].set_title('Sales Distribution')
+    axes[0,0].set_xlabel('Sales ($)')
+    
+    # Sales by Store
+    store_sales = categorical.group_mean(df, 'Sales', column='Store')
+    axes[0,1].bar(store_sales.index, store_sales.values, color='lightgreen')
+    axes[0,1].set_title('Average Sales by Store')
+    axes[0,1].set_xlabel('Store')
+    axes[0,1].tick_params(axis='x', rotation=45)
+    
+    # Sales over time
+    axes[1,0].plot(df['Date'], df['Sales'], color='orange', linewidth=2)
+    axes[1,0].set_title('Sales Trend Over Time')
+    axes[1,0].set_xlabel('Date')
+    axes[1,0].tick_params(axis='x', rotation=45)
+    
+    # Customers vs Sales
+    axes[1,1].scatter(df['Customers'], df['Sales'], alpha=0.6, color='red')
+    axes[1,1].set_title('Sales vs Customers')
+    axes[1,1].set_xlabel('Customers')
+    axes[1,1].set_ylabel('Sales ($)')
+    
+    fig.tight_layout()
+    return _to_png(fig)
+
+
 def show_content(df):
     st.markdown('<h2 class="tab-header">📈 Creating and Visualizing DataFrames</h2>', unsafe_allow_html=True)
     
@@ -33,16 +211,7 @@ plt.show()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    store_counts = df['Store'].value_counts()
-    ax.bar(store_counts.index, store_counts.values, color='skyblue')
-    ax.set_title('Number of Sales Records by Store')
-    ax.set_xlabel('Store')
-    ax.set_ylabel('Number of Records')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    st.pyplot(fig)
+    progressive.defer("tab4.store_counts_plot", df, st.image)
     
     # Changes in sales over time
     st.markdown("### Changes in sales over time")
@@ -60,16 +229,7 @@ plt.show()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(df['Date'], df['Sales'], marker='o', linewidth=2, markersize=4, color='green')
-    ax.set_title('Sales Over Time')
-    ax.set_xlabel('Date')
-    ax.set_ylabel('Sales ($)')
-    plt.xticks(rotation=45)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig)
+    progressive.defer("tab4.sales_over_time_plot", df, st.image)
     
     # Store performance comparison
     st.markdown("### Store performance comparison")
@@ -86,15 +246,7 @@ plt.show()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.boxplot(data=df, x='Store', y='Sales', ax=ax)
-    ax.set_title('Sales Distribution by Store')
-    ax.set_xlabel('Store')
-    ax.set_ylabel('Sales ($)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    st.pyplot(fig)
+    progressive.defer("tab4.boxplot", df, st.image)
     
     # Sales vs Customers relationship
     st.markdown("### Sales vs Customers relationship")
@@ -118,22 +270,7 @@ plt.show()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    colors = {'Store_A': 'red', 'Store_B': 'blue', 'Store_C': 'green', 
-              'Store_D': 'orange', 'Store_E': 'purple'}
-    for store in df['Store'].unique():
-        store_data = df[df['Store'] == store]
-        ax.scatter(store_data['Customers'], store_data['Sales'], 
-                  label=store, alpha=0.7, color=colors[store])
-    
-    ax.set_title('Sales vs Customers by Store')
-    ax.set_xlabel('Number of Customers')
-    ax.set_ylabel('Sales ($)')
-    ax.legend()
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig)
+    progressive.defer("tab4.scatter_plot", df, st.image)
     
     # Missing values
     st.markdown("## Missing values")
@@ -157,19 +294,20 @@ print(missing_percentage)
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    missing_values = df.isnull().sum()
+    missing_values = sections.get("tab4.missing_values", df)
     st.write("**Missing values in each column:**")
-    st.write(missing_values)
-    st.write(f"**Total missing values:** {df.isnull().sum().sum()}")
+    st.write(missing_values['counts'])
+    st.write(f"**Total missing values:** {missing_values['total']}")
     
     # Create sample data with missing values for demonstration
     st.markdown("### Creating sample data with missing values")
     code = '''
-# Create a copy with some artificial missing values for demonstration
-df_with_missing = df.copy()
-# Randomly set some values to NaN
-np.random.seed(42)
-missing_indices = np.random.choice(df_with_missing.index, size=10, replace=False)
+# A shallow copy to add artificial missing values to; with Copy-on-Write
+# only the columns written below are copied, and df itself is unchanged
+df_with_missing = df.copy(deep=False)
+# Randomly set some values to NaN (a local generator leaves the global seed alone)
+rng = np.random.default_rng(42)
+missing_indices = rng.choice(df_with_missing.index, size=10, replace=False)
 df_with_missing.loc[missing_indices[:5], 'Sales'] = np.nan
 df_with_missing.loc[missing_indices[5:], 'Customers'] = np.nan
 
@@ -177,14 +315,10 @@ print("Missing values in modified dataset:")
 print(df_with_missing.isnull().sum())
 '''
     st.code(code, language="python")
-    df_with_missing = df.copy()
-    np.random.seed(42)
-    missing_indices = np.random.choice(df_with_missing.index, size=10, replace=False)
-    df_with_missing.loc[missing_indices[:5], 'Sales'] = np.nan
-    df_with_missing.loc[missing_indices[5:], 'Customers'] = np.nan
+    missing_demo = sections.get("tab4.missing_demo", df)
     st.write("**Output:**")
     st.write("Missing values in modified dataset:")
-    st.write(df_with_missing.isnull().sum())
+    st.write(missing_demo['missing_counts'])
     
     # Removing missing values
     st.markdown("### Removing missing values")
@@ -196,23 +330,20 @@ print(f"After removing missing values: {df_no_missing.shape}")
 print(f"Rows removed: {len(df_with_missing) - len(df_no_missing)}")
 '''
     st.code(code, language="python")
-    df_no_missing = df_with_missing.dropna()
     st.write("**Output:**")
-    st.write(f"**Original shape:** {df_with_missing.shape}")
-    st.write(f"**After removing missing values:** {df_no_missing.shape}")
-    st.write(f"**Rows removed:** {len(df_with_missing) - len(df_no_missing)}")
+    st.write(f"**Original shape:** {missing_demo['shape']}")
+    st.write(f"**After removing missing values:** {missing_demo['no_missing_shape']}")
+    st.write(f"**Rows removed:** {missing_demo['shape'][0] - missing_demo['no_missing_shape'][0]}")
     
     # Replacing missing values
     st.markdown("### Replacing missing values")
     code = '''
-# Fill missing values with different strategies
-df_filled = df_with_missing.copy()
-
-# Fill Sales with mean
-df_filled['Sales'] = df_filled['Sales'].fillna(df_filled['Sales'].mean())
-
-# Fill Customers with median
-df_filled['Customers'] = df_filled['Customers'].fillna(df_filled['Customers'].median())
+# Fill missing values with different strategies: Sales with the mean,
+# Customers with the median
+df_filled = df_with_missing.assign(
+    Sales=df_with_missing['Sales'].fillna(df_with_missing['Sales'].mean()),
+    Customers=df_with_missing['Customers'].fillna(df_with_missing['Customers'].median()),
+)
 
 print("After filling missing values:")
 print(df_filled.isnull().sum())
@@ -220,14 +351,11 @@ print("\\nFirst few rows of filled data:")
 df_filled.head()
 '''
     st.code(code, language="python")
-    df_filled = df_with_missing.copy()
-    df_filled['Sales'] = df_filled['Sales'].fillna(df_filled['Sales'].mean())
-    df_filled['Customers'] = df_filled['Customers'].fillna(df_filled['Customers'].median())
     st.write("**Output:**")
     st.write("After filling missing values:")
-    st.write(df_filled.isnull().sum())
+    st.write(missing_demo['filled_counts'])
     st.write("First few rows of filled data:")
-    st.dataframe(df_filled.head())
+    st.dataframe(missing_demo['filled_head'])
     
     # Creating DataFrames
     st.markdown("## Creating DataFrames")
@@ -322,10 +450,9 @@ print(csv_string.split('\\n')[:6])  # Show first 6 lines
 print("\\nTo save to file: df.to_csv('filename.csv', index=False)")
 '''
     st.code(code, language="python")
-    csv_string = df.to_csv(index=False)
     st.write("**Output:**")
     st.write("First few lines of CSV:")
-    csv_lines = csv_string.split('\n')[:6]
+    csv_lines = sections.get("tab4.csv_lines", df)
     for line in csv_lines:
         if line:  # Skip empty lines
             st.code(line)
@@ -346,13 +473,9 @@ print("Advanced aggregation result:")
 result
 '''
     st.code(code, language="python")
-    result = (df.groupby('Store')
-              .agg({'Sales': ['mean', 'sum'], 'Customers': 'mean'})
-              .round(2))
-    result.columns = ['Avg_Sales', 'Total_Sales', 'Avg_Customers']
-    result = result.sort_values('Total_Sales', ascending=False)
+    result = sections.get("tab4.advanced_result", df)
     st.write("**Output:**")
-    st.dataframe(result)
+    show_dataframe(result, "tab4.advanced_result")
     
     # Summary visualization
     st.markdown("### Summary Dashboard")
@@ -389,32 +512,4 @@ plt.show()
 '''
     st.code(code, language="python")
     st.write("**Output:**")
-    
-    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-    
-    # Sales distribution
-    axes[0,0].hist(df['Sales'], bins=15, alpha=0.7, color='skyblue')
-    axes[0,0].set_title('Sales Distribution')
-    axes[0,0].set_xlabel('Sales ($)')
-    
-    # Sales by Store
-    store_sales = df.groupby('Store')['Sales'].mean()
-    axes[0,1].bar(store_sales.index, store_sales.values, color='lightgreen')
-    axes[0,1].set_title('Average Sales by Store')
-    axes[0,1].set_xlabel('Store')
-    axes[0,1].tick_params(axis='x', rotation=45)
-    
-    # Sales over time
-    axes[1,0].plot(df['Date'], df['Sales'], color='orange', linewidth=2)
-    axes[1,0].set_title('Sales Trend Over Time')
-    axes[1,0].set_xlabel('Date')
-    axes[1,0].tick_params(axis='x', rotation=45)
-    
-    # Customers vs Sales
-    axes[1,1].scatter(df['Customers'], df['Sales'], alpha=0.6, color='red')
-    axes[1,1].set_title('Sales vs Customers')
-    axes[1,1].set_xlabel('Customers')
-    axes[1,1].set_ylabel('Sales ($)')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
\ No newline at end of file
+    progressive.defer("tab4.dashboard", df, st.image)
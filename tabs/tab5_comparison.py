@@ -0,0 +1,47 @@
+import streamlit as st
+
+from core import compare, progressive
+from core.preview import show_dataframe
+
+
+def _show_diff(section_id, current_result, baseline_result):
+    changes = compare.diff(
+        compare.table(section_id, current_result),
+        compare.table(section_id, baseline_result)
+    )
+    show_dataframe(changes, f"compare.{section_id}")
+
+
+def show_content(df, baseline, current_label, baseline_label):
+    """Content for the dataset comparison tab"""
+    st.markdown('<h2 class="tab-header">🔀 Comparing Dataset Versions</h2>', unsafe_allow_html=True)
+    st.markdown(f"""
+    Every table below puts **{current_label}** next to **{baseline_label}**. Both sides come from
+    the same cached aggregates the other tabs use, lined up on their labels (stores, months,
+    statistics), so only the differences are computed here.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(f"Rows in {current_label}", f"{len(df):,}", delta=f"{len(df) - len(baseline):+,}")
+    with col2:
+        st.metric(f"Rows in {baseline_label}", f"{len(baseline):,}")
+
+    code = '''
+# Align two aggregates on their labels and subtract
+current, baseline = this_week.align(last_week, join='outer')
+change = current - baseline
+change_pct = (change / baseline.abs() * 100).round(2)
+'''
+    st.code(code, language="python")
+
+    for section_id, title, _ in compare.COMPARISONS:
+        st.markdown(f"### {title}")
+        # Either side may still be computing; the diff renders once both are in
+        progressive.defer(
+            section_id, df,
+            lambda current_result, section_id=section_id: progressive.defer(
+                section_id, baseline,
+                lambda baseline_result: _show_diff(section_id, current_result, baseline_result)
+            )
+        )
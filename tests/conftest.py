@@ -0,0 +1,18 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep the suite's disk caches away from the app's own
+os.environ.setdefault("PANDAS_HUB_CACHE_DIR", tempfile.mkdtemp(prefix="pandas-hub-tests-"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+from core.dataset import generate_sample_data  # noqa: E402
+
+
+@pytest.fixture
+def sample():
+    return generate_sample_data()
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import categorical
+
+
+@pytest.fixture(params=["sample", "with_gaps", "empty", "categorical", "single_values"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    if request.param == "with_gaps":
+        df = sample.copy()
+        df.loc[[0, 7, 33], 'Store'] = np.nan
+        df.loc[[2, 7, 40], 'Sales'] = np.nan
+        return df
+    if request.param == "empty":
+        return sample.iloc[:0]
+    if request.param == "single_values":
+        # Groups of one value, and a store whose every value is missing
+        df = sample.head(6).copy()
+        df.loc[df['Store'] == 'Store_E', 'Sales'] = np.nan
+        return df
+    return sample.assign(Store=pd.Categorical(sample['Store'], categories=[*sorted(sample['Store'].unique()), 'Store_Z']))
+
+
+def test_box_stats_match_matplotlib(frame):
+    from matplotlib import cbook
+
+    result = categorical.box_stats(frame, 'Sales')
+    groups = frame.dropna(subset=['Store', 'Sales']).groupby('Store', observed=True)['Sales']
+    expected = {store: cbook.boxplot_stats(values.to_numpy())[0] for store, values in groups}
+    # Stores in the order seaborn draws them: categories, else first appearance
+    if isinstance(frame['Store'].dtype, pd.CategoricalDtype):
+        order = list(frame['Store'].cat.categories)
+    else:
+        order = list(frame['Store'].dropna().unique())
+    assert [stats['label'] for stats in result] == [store for store in order if store in expected]
+    for stats in result:
+        reference = expected[stats['label']]
+        for key in ('q1', 'med', 'q3', 'whislo', 'whishi', 'iqr'):
+            assert stats[key] == reference[key], key
+        assert stats['mean'] == pytest.approx(reference['mean'])
+        np.testing.assert_array_equal(np.sort(stats['fliers']), np.sort(reference['fliers']))
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import categorical
+
+
+@pytest.fixture(params=["sample", "with_gaps", "empty", "categorical"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    if request.param == "with_gaps":
+        df = sample.copy()
+        df.loc[[0, 7, 33], 'Store'] = np.nan
+        df.loc[[2, 7, 40], 'Sales'] = np.nan
+        return df
+    if request.param == "empty":
+        return sample.iloc[:0]
+    # A category with no rows at all
+    return sample.assign(Store=pd.Categorical(sample['Store'], categories=[*sorted(sample['Store'].unique()), 'Store_Z']))
+
+
+def test_value_counts(frame):
+    for normalize in (False, True):
+        expected = frame['Store'].value_counts(normalize=normalize)
+        result = categorical.value_counts(frame, 'Store', normalize=normalize)
+        pd.testing.assert_series_equal(result, expected, check_index_type=False, check_dtype=False)
+
+
+def test_nunique(frame):
+    assert categorical.nunique(frame, 'Store') == frame['Store'].nunique()
+
+
+@pytest.mark.parametrize("value", ['Store_A', 'Store_E', 'Store_Z', 'missing'])
+def test_equals_mask(frame, value):
+    np.testing.assert_array_equal(categorical.equals_mask(frame, value), (frame['Store'] == value).to_numpy())
+
+
+def test_equals_mask_on_a_reordered_frame(sample):
+    reversed_rows = sample.iloc[::-1]
+    categorical.factorize(sample)
+    np.testing.assert_array_equal(
+        categorical.equals_mask(reversed_rows, 'Store_A'), (reversed_rows['Store'] == 'Store_A').to_numpy()
+    )
+
+
+def test_group_agg(frame):
+    spec = {'Sales': ['count', 'sum', 'mean', 'std', 'min', 'max'], 'Customers': ['mean', 'sum']}
+    expected = frame.groupby('Store', observed=True).agg(spec)
+    result = categorical.group_agg(frame, spec)
+    pd.testing.assert_frame_equal(result, expected, check_index_type=False, check_dtype=False)
+
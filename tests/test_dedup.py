@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import dedup
+
+
+@pytest.fixture(params=["sample", "repeated", "with_gaps", "empty", "arrow_strings"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    repeated = pd.concat([sample, sample.iloc[[0, 3, 3, 17]], sample.iloc[::5]], ignore_index=True)
+    if request.param == "repeated":
+        return repeated
+    if request.param == "with_gaps":
+        df = repeated.copy()
+        df.loc[[0, 50, 60], 'Sales'] = np.nan
+        df.loc[[1, 51], 'Store'] = None
+        df.loc[[2, 52, 53], 'Date'] = pd.NaT
+        return df
+    if request.param == "empty":
+        return sample.iloc[:0]
+    pa = pytest.importorskip("pyarrow")
+    return repeated.astype({'Store': pd.ArrowDtype(pa.string())})
+
+
+@pytest.mark.parametrize("subset", [None, ['Date', 'Store'], ['Store']])
+def test_duplicate_report_matches_pandas(frame, subset):
+    expected = frame.duplicated(subset=subset)
+    report = dedup.duplicate_report(frame, subset=subset, sample_size=3)
+    assert report['rows'] == len(frame)
+    assert report['duplicates'] == expected.sum()
+    assert report['unique'] == len(frame) - expected.sum()
+    if expected.any():
+        pd.testing.assert_frame_equal(report['samples'], frame[expected].head(3))
+    else:
+        assert report['samples'].empty
+
+
+@pytest.mark.parametrize("chunks", [1, 3, 7, 40])
+def test_tracker_over_chunks_matches_pandas(frame, chunks):
+    tracker = dedup.DuplicateTracker()
+    bounds = np.linspace(0, len(frame), chunks + 1).astype(int)
+    masks = [tracker.add(frame.iloc[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])]
+    np.testing.assert_array_equal(np.concatenate(masks), frame.duplicated().to_numpy())
+    assert tracker.duplicates == frame.duplicated().sum()
+
+
+def test_tracker_after_a_chunk_of_only_duplicates(sample):
+    tracker = dedup.DuplicateTracker()
+    tracker.add(sample.iloc[:0])
+    tracker.add(sample.iloc[:10])
+    assert tracker.add(sample.iloc[[1, 1, 2]]).all()
+    assert not tracker.add(sample.iloc[10:20]).any()
+    assert tracker.add(sample.iloc[[5, 15]]).all()
+    assert tracker.duplicates == 5
+
+
+def test_scan_parquet_matches_pandas(tmp_path, sample):
+    repeated = pd.concat([sample, sample.iloc[::3]], ignore_index=True)
+    repeated.iloc[:40].to_parquet(tmp_path / "part-0.parquet")
+    repeated.iloc[40:].to_parquet(tmp_path / "part-1.parquet")
+    for subset in (None, ['Date', 'Store']):
+        report = dedup.scan_parquet(tmp_path, subset=subset, batch_rows=16)
+        assert report['rows'] == len(repeated)
+        assert report['duplicates'] == repeated.duplicated(subset=subset).sum()
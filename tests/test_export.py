@@ -0,0 +1,21 @@
+import io
+import json
+import zipfile
+
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+import tabs.tab2_aggregating  # noqa: F401  (registers the section)
+from core import export, sections
+
+
+def test_bundle_is_accepted_by_download_button(sample):
+    results = [("tab2.store_counts", {}, sections.compute("tab2.store_counts", sample))]
+    data, _ = convert_data_to_bytes_and_infer_mime(
+        export.bundle_bytes(sample, results), StreamlitAPIException("unsupported")
+    )
+    with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+        manifest = json.loads(bundle.read(export.MANIFEST))
+        assert [entry['section'] for entry in manifest['tables']].count("tab2.store_counts") == 1
+        for entry in manifest['tables']:
+            assert entry['file'] in bundle.namelist()
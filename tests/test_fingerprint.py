@@ -0,0 +1,39 @@
+import pytest
+
+from core import registry
+from core.fingerprint import fingerprint, sampled_hash, stamp
+
+
+@pytest.mark.parametrize("derive", [
+    lambda df: df.sort_values('Sales'),
+    lambda df: df.assign(Sales=df['Sales'] * 2),
+    lambda df: df.fillna(0),
+    lambda df: df.iloc[::-1],
+])
+def test_derived_frames_do_not_inherit_the_stamp(sample, derive):
+    derived = derive(sample)
+    assert fingerprint(derived) != fingerprint(sample)
+    assert fingerprint(derived) == sampled_hash(derived)
+
+
+def test_derived_frames_with_different_values_differ(sample):
+    tokens = {
+        fingerprint(sample.sort_values('Sales')),
+        fingerprint(sample.assign(Sales=sample['Sales'] * 2)),
+        fingerprint(sample.assign(Sales=-sample['Sales'])),
+    }
+    assert len(tokens) == 3
+
+
+def test_stamp_belongs_to_the_stamped_object(sample):
+    copy = sample.copy()
+    stamp(copy, "copy-v1")
+    assert fingerprint(copy) == "copy-v1"
+    assert fingerprint(copy.head()) != "copy-v1"
+    assert fingerprint(sample) != "copy-v1"
+
+
+def test_shared_frame_keeps_the_token(sample):
+    shared = registry.publish("test-fingerprint", sample)
+    assert shared is not sample
+    assert fingerprint(shared) == fingerprint(sample)
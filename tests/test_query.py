@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import query
+
+
+def run(text, df):
+    return query.mask(query.plan_for(text, df), df)
+
+
+@pytest.mark.parametrize("text", [
+    "Sales > 3000 and Customers > 100",
+    "Store in ['Store_A', 'Store_B'] and Sales > 2500",
+    "Store not in ('Store_C',) or not Sales < 2000",
+    "(Sales * 2 > 6000) & ~(Customers <= 100)",
+    "2000 < Sales <= 3500",
+    "Sales / Customers > 25",
+])
+def test_matches_pandas_query(sample, text):
+    expected = sample.eval(text, engine='python').to_numpy(dtype=bool)
+    np.testing.assert_array_equal(run(text, sample), expected)
+
+
+@pytest.mark.parametrize("text", [
+    "'Store_A' in Store",
+    "Store in Store",
+    "'a' * 99999999999 == Store",
+    "Sales > 3000 and 'x'",
+    "Sales > 3000 or Customers",
+    "Store + 'x' == 'Store_Ax'",
+    "1 < 2",
+    "(2 * 3) + Sales > 10",
+    "Sales",
+    "__import__('os')",
+    "df.Sales > 1",
+])
+def test_rejects_unsupported_queries(sample, text):
+    with pytest.raises(query.QueryError):
+        run(text, sample)
+
+
+def test_evaluation_failures_are_query_errors(sample):
+    with pytest.raises(query.QueryError):
+        run("Store > 5", sample)
+
+
+def test_numexpr_path_matches_python_path():
+    if not query.HAS_NUMEXPR:
+        pytest.skip("numexpr is not installed")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Sales': rng.normal(3000, 500, query.NUMEXPR_MIN_ROWS),
+        'Customers': rng.integers(50, 200, query.NUMEXPR_MIN_ROWS),
+    })
+    plan = query.plan_for("Sales > 3000 and Customers * 2 < 250", df)
+    assert plan.numeric_only
+    np.testing.assert_array_equal(query.mask(plan, df), query._evaluate(plan.tree, df).to_numpy())
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+from core import registry
+from core.fingerprint import fingerprint
+
+
+@pytest.fixture
+def empty_registry(monkeypatch, tmp_path):
+    monkeypatch.setattr(registry, "_datasets", OrderedDict())
+    monkeypatch.setattr(registry, "_spilled", {})
+    monkeypatch.setattr(registry, "SPILL_DIR", tmp_path / "datasets")
+    monkeypatch.setattr(registry, "DATASET_CACHE_MAX_BYTES", 0)
+
+
+def test_spills_datasets_with_path_like_names(empty_registry, sample):
+    first = registry.publish("parquet:/tmp/x/week1", sample)
+    registry.publish("parquet:/tmp/x/week2", sample.assign(Sales=sample['Sales'] + 1))
+    assert list(registry.datasets()) == ["parquet:/tmp/x/week2"]
+    path, token = registry._spilled["parquet:/tmp/x/week1"]
+    assert path.parent == registry.SPILL_DIR
+    assert token == fingerprint(first)
+
+    reloaded = registry.get_or_create("parquet:/tmp/x/week1", lambda: pytest.fail("rebuilt"))
+    pd.testing.assert_frame_equal(reloaded, sample)
+    assert fingerprint(reloaded) == token
+
+
+def test_failed_spill_keeps_the_dataset_resident(empty_registry, sample, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", fail)
+    registry.publish("week1", sample)
+    registry.publish("week2", sample.head(10))
+    assert set(registry.datasets()) == {"week1", "week2"}
+    assert registry._spilled == {}
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import rollup
+
+def _expected(df, metric, freq, stat):
+    period = df['Date'].dt.to_period(rollup.FREQUENCIES[freq]).dt.start_time.rename('Period')
+    return df.groupby([period, 'Store'])[metric].agg(stat).unstack('Store').astype('float64')
+
+
+@pytest.fixture(params=["sample", "with_gaps", "one_row"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    if request.param == "with_gaps":
+        df = sample.copy()
+        df.loc[[0, 5, 6, 40], 'Sales'] = np.nan
+        df.loc[[3, 41], 'Store'] = np.nan
+        df.loc[[8, 42], 'Date'] = pd.NaT
+        return df
+    return sample.head(1)
+
+
+@pytest.mark.parametrize("freq", list(rollup.FREQUENCIES))
+@pytest.mark.parametrize("stat", rollup.STATS)
+def test_rollup_matches_groupby(frame, freq, stat):
+    result = rollup.rollup(rollup.build_cube(frame), 'Sales', freq=freq, stat=stat)
+    expected = _expected(frame, 'Sales', freq, stat)
+    assert not result.empty
+    pd.testing.assert_frame_equal(
+        result, expected, check_column_type=False, check_index_type=False, check_freq=False, check_exact=False, rtol=1e-9, atol=1e-6
+    )
+
+
+def test_rollup_of_a_date_range_matches_groupby(sample):
+    start, end = pd.Timestamp('2024-01-10'), pd.Timestamp('2024-02-05')
+    result = rollup.rollup(rollup.build_cube(sample), 'Customers', freq='Weekly', stat='mean', start=start, end=end)
+    expected = _expected(sample[sample['Date'].between(start, end)], 'Customers', 'Weekly', 'mean')
+    pd.testing.assert_frame_equal(result, expected, check_column_type=False, check_index_type=False, check_freq=False)
+
+
+def test_rows_without_store_or_date_are_left_out(sample):
+    df = sample.copy()
+    df.loc[3, 'Store'] = np.nan
+    df.loc[8, 'Date'] = pd.NaT
+    cube = rollup.build_cube(df)
+    assert cube.counts['Sales'].sum() == len(df) - 2
+    assert cube.sums['Sales'].sum() == pytest.approx(df.drop([3, 8])['Sales'].sum())
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({'Date': pd.to_datetime([]), 'Store': [], 'Sales': [], 'Customers': []}),
+    pd.DataFrame({'Date': [pd.NaT, pd.NaT], 'Store': ['Store_A', None], 'Sales': [1.0, 2.0], 'Customers': [1, 2]}),
+])
+def test_frames_without_valid_rows(df):
+    cube = rollup.build_cube(df)
+    assert len(cube.days) == 0
+    assert rollup.rollup(cube, 'Sales').empty
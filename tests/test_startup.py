@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+from core.benchmarks import APP_MODULES, IMPORT_BUDGET_MS, LAZY_MODULES, ROOT, import_times
+
+
+def test_cold_import_is_within_budget():
+    total_ms = sum(import_times().values()) * 1000
+    assert total_ms < IMPORT_BUDGET_MS
+
+
+def test_plotting_is_imported_lazily():
+    # A fresh interpreter: other tests may already have loaded plotting here
+    script = (
+        f"import sys; import {', '.join(APP_MODULES)};"
+        f"print(' '.join(name for name in sys.modules if name.split('.')[0] in {LAZY_MODULES!r}))"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import summary
+from core.dataset import with_backend
+
+
+@pytest.fixture(params=["sample", "with_gaps", "empty", "all_missing", "one_row", "pyarrow"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    if request.param == "with_gaps":
+        df = sample.copy()
+        df.loc[[1, 9, 30], 'Sales'] = np.nan
+        df.loc[[4, 9], 'Date'] = pd.NaT
+        return df.assign(Customers=df['Customers'].astype('Int64').mask(df.index % 7 == 0))
+    if request.param == "empty":
+        return sample.iloc[:0]
+    if request.param == "all_missing":
+        return sample.assign(Sales=np.nan, Date=pd.NaT)
+    if request.param == "one_row":
+        return sample.head(1)
+    return with_backend(sample, "pyarrow")
+
+
+def test_describe_matches_pandas(frame):
+    expected = frame.describe()
+    result = summary.describe(frame)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=False, rtol=1e-12)
+
+
+def test_agg_matches_pandas(frame):
+    statistics = list(summary.STATISTICS)
+    expected = frame[['Sales', 'Customers']].agg(statistics).astype('float64')
+    result = summary.agg(frame, ['Sales', 'Customers'], statistics)
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+
+
+def test_column_statistics_of_dates(frame):
+    dates = frame['Date']
+    stats = summary.column(frame, 'Date')
+    assert stats['count'] == dates.count()
+    for name in ('mean', 'min', 'max'):
+        expected = getattr(dates, name)()
+        assert stats[name] is pd.NaT if pd.isna(expected) else stats[name] == expected
+    assert stats['quantiles'][0.5] is pd.NaT if pd.isna(dates.median()) else stats['quantiles'][0.5] == dates.median()
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import topk
+
+
+@pytest.fixture
+def with_gaps(sample):
+    # Missing group keys and sort values, plus ties on Sales
+    df = sample.copy()
+    df.loc[[3, 17, 28], 'Store'] = np.nan
+    df.loc[[5, 40], 'Sales'] = np.nan
+    df.loc[[10, 11, 12], 'Sales'] = 2500.0
+    return df
+
+
+def expected_per_group(df, k, ascending=False, dropna=True):
+    ordered = df.sort_values('Sales', ascending=ascending, kind='stable')
+    return ordered.groupby('Store', dropna=dropna).head(k)
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 100])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_top_k_per_group_matches_groupby_head(with_gaps, k, ascending):
+    result = topk.top_k_per_group(with_gaps, 'Store', 'Sales', k, ascending=ascending)
+    expected = expected_per_group(with_gaps, k, ascending)
+    pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index())
+
+
+def test_top_k_per_group_keeps_missing_keys_without_dropna(with_gaps):
+    result = topk.top_k_per_group(with_gaps, 'Store', 'Sales', 2, dropna=False)
+    expected = expected_per_group(with_gaps, 2, dropna=False)
+    pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index())
+    assert result['Store'].isna().sum() == 2
+
+
+def test_top_k_per_group_on_sample_drops_nothing(sample):
+    result = topk.top_k_per_group(sample, 'Store', 'Sales', 3)
+    assert len(result) == len(expected_per_group(sample, 3))
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 50, 60])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_top_k_matches_sort_values(with_gaps, k, ascending):
+    result = topk.top_k(with_gaps, 'Sales', k, ascending=ascending)
+    expected = with_gaps.sort_values('Sales', ascending=ascending, kind='stable').head(k)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_top_k_on_an_empty_frame(sample):
+    empty = sample.iloc[:0]
+    assert topk.top_k(empty, 'Sales', 3).empty
+    assert topk.top_k_per_group(empty, 'Store', 'Sales', 3).empty
+
+
+@pytest.fixture
+def exact_keys():
+    # Keys float64 cannot tell apart: int64 above 2**53, nanosecond times,
+    # uint64 above int64's range, plus real infinities next to NaN
+    big = 2**62
+    return pd.DataFrame({
+        'Store': ['Store_A', 'Store_B'] * 4,
+        'Id': np.array([big + 3, big + 1, big + 2, big + 1, -big - 1, -big - 2, big, big + 3], dtype=np.int64),
+        'Nullable': pd.array([big + 1, None, big, big + 2, None, big + 1, big + 3, big], dtype='Int64'),
+        'Unsigned': np.array([2**64 - 1, 2**64 - 3, 2**64 - 2, 5, 2**64 - 1, 0, 7, 2**64 - 3], dtype=np.uint64),
+        'Time': pd.to_datetime(1_700_000_000_000_000_000 + np.array([3, 1, 2, 1, 0, 5, 4, 6]), unit='ns'),
+        'Sales': [np.inf, np.nan, 1.0, -np.inf, np.nan, np.inf, 2.0, 1.0],
+        'Name': ['b', 'a', None, 'c', 'a', 'b', 'd', 'c'],
+    })
+
+
+@pytest.mark.parametrize("by", ['Id', 'Nullable', 'Unsigned', 'Time', 'Sales', 'Name', ['Name', 'Id'], ['Nullable', 'Sales']])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_top_k_is_exact_for_keys_floats_cannot_hold(exact_keys, by, ascending, k):
+    result = topk.top_k(exact_keys, by, k, ascending=ascending)
+    expected = exact_keys.sort_values(by, ascending=ascending, kind='stable').head(k)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("by", ['Id', 'Nullable', 'Time'])
+def test_top_k_per_group_is_exact_for_large_keys(exact_keys, by):
+    result = topk.top_k_per_group(exact_keys, 'Store', by, 2)
+    expected = exact_keys.sort_values(by, ascending=False, kind='stable').groupby('Store').head(2)
+    pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index())
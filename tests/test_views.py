@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from core import missing
+from core.benchmarks import allocated, synthetic_frame
+from tabs import tab2_aggregating
+
+ROWS = 200_000
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return synthetic_frame(ROWS)
+
+
+def shares(derived, df, column):
+    return np.shares_memory(derived[column].to_numpy(), df[column].to_numpy())
+
+
+def test_derived_columns_share_the_base_buffers(frame):
+    derived = tab2_aggregating._pivot_data(frame)
+    for column in ('Date', 'Sales', 'Customers'):
+        assert shares(derived, frame, column)
+    assert 'Month' not in frame
+
+
+def test_deriving_allocates_far_less_than_a_deep_copy(frame):
+    def deep_copy():
+        derived = frame.copy()
+        derived['Month'] = derived['Date'].dt.month
+
+    assert allocated(tab2_aggregating._pivot_data, frame) < allocated(deep_copy) / 2
+
+
+def test_injecting_missing_values_copies_only_the_written_columns(frame):
+    working = missing.inject_missing(frame, ['Sales'], rate=0.1)
+    assert shares(working, frame, 'Customers')
+    assert not shares(working, frame, 'Sales')
+    assert working['Sales'].isna().sum() == ROWS // 10
+    assert not frame['Sales'].isna().any()
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import windows
+
+WINDOWS = (1, 7, 28, 10_000)
+STATS = ('sum', 'mean', 'count', 'min', 'max')
+
+
+def _expected(df, value, w, stat, by='Store', on='Date'):
+    # pandas needs dates without NaT and sorted within each group, and
+    # labels the result by date, so groups are rolled one at a time and
+    # put back in their rows
+    dated = df[df[on].notna()].sort_values(on, kind='stable')
+    expected = pd.Series(np.nan, index=df.index)
+    for _, group in dated.groupby(by):
+        rolled = group.set_index(on)[value].rolling(f'{w}D').agg(stat)
+        expected[group.index] = rolled.to_numpy(dtype='float64')
+    return expected
+
+
+@pytest.fixture(params=["sample", "with_gaps", "empty", "one_row", "shuffled"])
+def frame(request, sample):
+    if request.param == "sample":
+        return sample
+    if request.param == "with_gaps":
+        df = sample.copy()
+        df.loc[[0, 5, 6, 7, 40], 'Sales'] = np.nan
+        df.loc[[3, 41], 'Store'] = np.nan
+        df.loc[[8, 42], 'Date'] = pd.NaT
+        return df
+    if request.param == "empty":
+        return sample.iloc[:0]
+    if request.param == "one_row":
+        return sample.head(1)
+    return sample.sample(frac=1, random_state=0)
+
+
+def test_rolling_windows_match_pandas(frame):
+    result = windows.rolling_windows(frame, 'Sales', windows=WINDOWS, stats=STATS)
+    assert list(result.columns) == [f'Sales_{stat}_{w}d' for w in WINDOWS for stat in STATS]
+    pd.testing.assert_index_equal(result.index, frame.index)
+    for w in WINDOWS:
+        for stat in STATS:
+            pd.testing.assert_series_equal(
+                result[f'Sales_{stat}_{w}d'], _expected(frame, 'Sales', w, stat),
+                check_names=False, check_exact=False, rtol=1e-9,
+            )
+
+
+def test_rows_without_key_or_date_are_nan(sample):
+    df = sample.copy()
+    df.loc[3, 'Store'] = np.nan
+    df.loc[8, 'Date'] = pd.NaT
+    result = windows.rolling_windows(df, 'Sales', windows=(7,), stats=('count',))
+    assert result.loc[[3, 8]].isna().all().all()
+    assert result.drop([3, 8]).notna().all().all()
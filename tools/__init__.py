@@ -0,0 +1 @@
+"""Developer tooling that drives the app from outside; not imported by the app."""
@@ -0,0 +1,298 @@
+import hashlib
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "pandas_learning_app.py"
+
+# Widget settings sessions cycle through, so concurrent sessions render
+# different pages and any leak between them changes what one of them shows
+VARIANTS = (
+    {},
+    {'rollup_freq': 'Daily', 'rollup_stat': 'mean', 'query_text': "Store == 'Store_A'"},
+    {'rollup_freq': 'Monthly', 'rollup_metric': 'Customers', 'query_group': 'Store'},
+    {'rollup_stat': 'std', 'query_text': "Sales > 2500 and Customers < 150", 'query_group': 'Store'},
+)
+
+# Caption of a section still computing in the background (core.progressive);
+# whether a run shows it depends on timing, not on the session's data
+PENDING = "⏳ Computing…"
+
+# Root container of the page's main area in delta paths; the sidebar holds
+# per-process instrumentation that legitimately differs between runs
+MAIN = 0
+
+
+@dataclass
+class SessionResult:
+    index: int
+    latencies: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    mismatches: int = 0
+
+
+@contextmanager
+def serve(port=None, startup_timeout=60):
+    """Launch the app with ``streamlit run`` and yield (base URL, server pid)"""
+    if port is None:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+    url = f"127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP),
+         "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"streamlit run exited with code {server.returncode}")
+            try:
+                urllib.request.urlopen(f"http://{url}/_stcore/health", timeout=1).read()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"The app did not come up on {url} within {startup_timeout}s") from None
+                time.sleep(0.2)
+        yield url, server.pid
+    finally:
+        server.terminate()
+        server.wait()
+
+
+class Session:
+    """One browser tab, speaking Streamlit's websocket protocol to the server"""
+
+    def __init__(self, url, timeout):
+        from websockets.sync.client import connect
+
+        self.timeout = timeout
+        self.elements = {}
+        self._widgets = {}
+        self._socket = connect(f"ws://{url}/_stcore/stream", subprotocols=["streamlit"], max_size=None)
+
+    def close(self):
+        self._socket.close()
+
+    def set(self, key, value):
+        """Set a keyed text input or selectbox of the last run, as a user would"""
+        for element in self.elements.values():
+            widget = getattr(element, element.WhichOneof('type'))
+            if getattr(widget, 'id', '').endswith(f"-{key}"):
+                self._widgets[key] = (widget.id, str(value))
+                return
+        raise KeyError(f"No widget with key {key!r} on the page")
+
+    def run(self):
+        """Rerun the script with the widget values set so far; returns seconds taken"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        for widget_id, value in self._widgets.values():
+            request.rerun_script.widget_states.widgets.add(id=widget_id, string_value=value)
+        self.elements = {}
+        start = time.perf_counter()
+        self._socket.send(request.SerializeToString())
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self._socket.recv(timeout=self.timeout))
+            kind = message.WhichOneof('type')
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                # Later deltas to the same path replace the element, as in the browser
+                self.elements[tuple(message.metadata.delta_path)] = message.delta.new_element
+            elif kind == 'script_finished':
+                return time.perf_counter() - start
+
+    def errors(self):
+        return [
+            element.exception.message for element in self.elements.values()
+            if element.WhichOneof('type') == 'exception'
+        ]
+
+    def digest(self):
+        """Hash of everything the main area shows, whatever order it arrived in
+
+        Two sessions with the same widget values must produce the same digest.
+        Sections finishing before or after their placeholder is drawn move
+        elements around, so the page is compared as a multiset of elements,
+        and tables are compared by content rather than by their Arrow bytes.
+        """
+        parts = Counter()
+        for path, element in self.elements.items():
+            if path[0] != MAIN or element.WhichOneof('type') == 'markdown' and element.markdown.body == PENDING:
+                continue
+            element = type(element).FromString(element.SerializeToString())
+            if element.WhichOneof('type') == 'download_button':
+                # Per-session handle of the bundle built on click
+                element.download_button.ClearField('deferred_file_id')
+                element.download_button.ClearField('url')
+            _canonical(element)
+            parts[hashlib.sha256(element.SerializeToString(deterministic=True)).hexdigest()] += 1
+        return hashlib.sha256(repr(sorted(parts.items())).encode()).hexdigest()
+
+
+def _table_digest(ipc):
+    # The same table serializes to different IPC bytes depending on how its
+    # buffers were laid out (computed fresh vs unpickled from the disk
+    # cache), so the decoded schema and values are hashed instead
+    import pyarrow as pa
+
+    if not ipc:
+        return b""
+    table = pa.ipc.open_stream(ipc).read_all()
+    content = repr((table.schema.to_string(truncate_metadata=False, show_schema_metadata=True), table.to_pydict()))
+    return hashlib.sha256(content.encode()).digest()
+
+
+def _canonical(message):
+    # Replace every Arrow payload in the message tree by the digest of its table
+    if message.DESCRIPTOR.name == 'ArrowData':
+        message.data = _table_digest(message.data)
+        if message.HasField('styler'):
+            message.styler.display_values = _table_digest(message.styler.display_values)
+        return
+    for field, value in message.ListFields():
+        if field.message_type is not None:
+            for item in value if field.is_repeated else [value]:
+                _canonical(item)
+
+
+def _variant_session(url, variant, timeout):
+    # A new session on the default page, then the variant's widget values
+    session = Session(url, timeout)
+    session.run()
+    for key, value in variant.items():
+        session.set(key, value)
+    return session
+
+
+def reference_digests(url, timeout):
+    """Digest of every variant from one session at a time"""
+    digests = []
+    for variant in VARIANTS:
+        session = _variant_session(url, variant, timeout)
+        try:
+            session.run()
+            digests.append(session.digest())
+        finally:
+            session.close()
+    return digests
+
+
+def _session(url, index, reruns, timeout, references, start):
+    result = SessionResult(index)
+    variant = index % len(VARIANTS)
+    # Every session starts together, like a burst of visitors
+    start.wait()
+    try:
+        began = time.perf_counter()
+        session = _variant_session(url, VARIANTS[variant], timeout)
+        result.latencies.append(time.perf_counter() - began)
+        try:
+            for _ in range(1 + reruns):
+                result.latencies.append(session.run())
+                result.errors.extend(session.errors())
+                if session.digest() != references[variant]:
+                    result.mismatches += 1
+        finally:
+            session.close()
+    except Exception as exc:
+        result.errors.append(f"{type(exc).__name__}: {exc}")
+    return result
+
+
+def _rss(pid):
+    # Bytes; Linux only
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class _RssSampler(threading.Thread):
+    """Peak resident memory of the server while the sessions run"""
+
+    def __init__(self, pid, interval=0.1):
+        super().__init__(daemon=True)
+        self.pid, self.interval = pid, interval
+        self.peak = _rss(pid)
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            rss = _rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def run(sessions=8, reruns=3, timeout=300, port=None):
+    """Drive concurrent sessions against a locally launched app server
+
+    The app runs under ``streamlit run`` in its own process and every session
+    is a websocket client on a thread of this one, so the server executes
+    the sessions' scripts concurrently exactly as it does for browsers. Each
+    session loads the page, applies its variant's widget values and reruns;
+    every page it renders from then on is checked against the same variant
+    rendered by a lone session first. Returns throughput, latency
+    percentiles, the server's memory and the sessions whose output differed
+    or raised.
+
+    The lone reference runs fill the disk cache, so sessions share persisted
+    results and concurrently execute the script, their session state and
+    the widget-driven sections, as a busy server does.
+    """
+    with serve(port) as (url, pid):
+        references = reference_digests(url, timeout)
+        rss_before = _rss(pid)
+        sampler = _RssSampler(pid)
+        sampler.start()
+        start = threading.Barrier(sessions)
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="session") as pool:
+            futures = [
+                pool.submit(_session, url, index, reruns, timeout, references, start)
+                for index in range(sessions)
+            ]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - began
+        sampler.stop()
+        rss_after = _rss(pid)
+
+    latencies = np.array([seconds for result in results for seconds in result.latencies])
+    return {
+        'sessions': sessions,
+        'runs': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'latency': {
+            **{f"p{p}": float(np.percentile(latencies, p)) for p in (50, 95, 99)},
+            'max': float(latencies.max()),
+        } if len(latencies) else {},
+        'peak_rss': sampler.peak,
+        'rss_growth': None if rss_before is None or rss_after is None else rss_after - rss_before,
+        'interference': [result.index for result in results if result.mismatches],
+        'errors': {result.index: result.errors for result in results if result.errors},
+    }